@@ -0,0 +1,90 @@
+"""``DATABASES['default']`` built from environment variables.
+
+SQLite by default, tuned so a refresh writing stories one by one does not
+stall the read API (see ``SQLITE_PRAGMAS``). ``DATABASE_URL`` switches to
+PostgreSQL, e.g. ``postgres://ynews:secret@db:5432/ynews?sslmode=require``.
+"""
+
+from typing import Dict, Mapping
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Run on every new SQLite connection. Each can be overridden with an
+# environment variable named after it, e.g. SQLITE_MMAP_SIZE=0.
+SQLITE_PRAGMAS = {
+    # Readers see the last commit while a write is in progress instead of
+    # waiting for it, and commits do not block them either.
+    'journal_mode': 'WAL',
+    # With WAL, fsync at checkpoints rather than on every commit; a power
+    # loss can drop the last commits but never corrupts the file.
+    'synchronous': 'NORMAL',
+    # Milliseconds a connection waits for the write lock before failing
+    # with "database is locked".
+    'busy_timeout': '5000',
+    # Page cache per connection; negative values are KiB.
+    'cache_size': '-20000',
+    # Bytes of the file read through memory mapping instead of read().
+    'mmap_size': str(128 * 1024 * 1024),
+}
+
+POSTGRES_SCHEMES = ('postgres', 'postgresql')
+
+
+def sqlite_pragmas(environ: Mapping[str, str]) -> Dict[str, str]:
+    return {name: environ.get(f'SQLITE_{name.upper()}', value) for name, value in SQLITE_PRAGMAS.items()}
+
+
+def database_settings(environ: Mapping[str, str], default_sqlite_path) -> dict:
+    """The default database for ``environ``.
+
+    ``DJANGO_CONN_MAX_AGE`` (seconds) keeps connections open between
+    requests on the same thread. It defaults to 0: under the ASGI server
+    every request runs in a new thread, so a kept connection is never reused
+    and only piles up. On PostgreSQL, ``DATABASE_POOL=1`` reuses connections
+    through psycopg's pool instead. ``DJANGO_SQLITE_TUNING=0`` leaves SQLite
+    connections as Django opens them.
+    """
+    conn_max_age = int(environ.get('DJANGO_CONN_MAX_AGE', '0'))
+    url = environ.get('DATABASE_URL')
+    if url:
+        database = _postgres_settings(url)
+        if environ.get('DATABASE_POOL') == '1':
+            # Django refuses persistent connections together with a pool.
+            database['OPTIONS']['pool'] = True
+            conn_max_age = 0
+    else:
+        database = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': environ.get('DJANGO_SQLITE_PATH', default_sqlite_path),
+            'OPTIONS': {},
+        }
+        if environ.get('DJANGO_SQLITE_TUNING', '1') != '0':
+            database['OPTIONS'] = {
+                'init_command': ';'.join(
+                    f'PRAGMA {name}={value}' for name, value in sqlite_pragmas(environ).items()
+                ),
+                # Take the write lock when a transaction starts, so busy_timeout
+                # applies; a deferred transaction that later needs to write
+                # fails at once if another connection is writing.
+                'transaction_mode': 'IMMEDIATE',
+            }
+
+    database['CONN_MAX_AGE'] = conn_max_age
+    database['CONN_HEALTH_CHECKS'] = conn_max_age > 0
+    return database
+
+
+def _postgres_settings(url: str) -> dict:
+    parts = urlsplit(url)
+    if parts.scheme not in POSTGRES_SCHEMES:
+        raise ImproperlyConfigured(f"DATABASE_URL must start with postgres://, not {parts.scheme}://")
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': unquote(parts.path.lstrip('/')),
+        'USER': unquote(parts.username or ''),
+        'PASSWORD': unquote(parts.password or ''),
+        'HOST': parts.hostname or '',
+        'PORT': str(parts.port or ''),
+        'OPTIONS': dict(parse_qsl(parts.query)),
+    }
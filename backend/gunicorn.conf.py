@@ -0,0 +1,30 @@
+"""Gunicorn settings for serving ``backend.asgi`` with Uvicorn workers.
+
+    gunicorn -c backend/gunicorn.conf.py backend.asgi:application
+
+Each worker is a separate process with its own event loop, shared by async
+views and event streams; sync views each get a thread for their request.
+Every worker that runs a refresh (or warms up, with NEWS_SUMMARIZER_WARMUP)
+loads its own copy of the summarization model, so size WEB_CONCURRENCY to
+the memory available rather than to the CPU count alone.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+# Event streams stay open for minutes, but async workers still heartbeat
+# while serving them, so the timeout only catches hung workers.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+# Give open event streams a moment to close on reload or shutdown.
+graceful_timeout = 10
+keepalive = 5
+
+# No max_requests: recycling a worker would kill the refresh jobs running in
+# its threads (news/services/jobs.py) and leave them marked active.
+
+accesslog = '-'
+errorlog = '-'
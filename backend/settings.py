@@ -10,10 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 from django.utils.translation import gettext_lazy as _
 
+from .database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -79,12 +82,35 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# SQLite (DJANGO_SQLITE_PATH, default db.sqlite3) in WAL mode with a busy
+# timeout, or PostgreSQL with DATABASE_URL=postgres://...; see backend/database.py.
+
 DATABASES = {
+    'default': database_settings(os.environ, BASE_DIR / 'db.sqlite3'),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Shared through files by default: server workers and management commands
+# such as `fetch_hn` are separate processes, and a refresh in any of them has
+# to invalidate the responses all the others cached. A per-process backend
+# (LocMemCache) only suits a single process that does all the writing.
+# Tests run on a LocMemCache instead (backend/test_runner.py).
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', str(BASE_DIR / 'cache')),
     }
 }
+if CACHES['default']['BACKEND'].endswith('.FileBasedCache'):
+    # FileBasedCache unpickles whatever it finds in LOCATION, so nobody but
+    # this user may write there; chmod fails on a directory someone else owns.
+    os.makedirs(CACHES['default']['LOCATION'], mode=0o700, exist_ok=True)
+    os.chmod(CACHES['default']['LOCATION'], 0o700)
+
+TEST_RUNNER = 'backend.test_runner.TestRunner'
 
 
 # Password validation
@@ -141,6 +167,90 @@ SPECTACULAR_SETTINGS = {
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Load and warm up the summarization model when the app starts instead of on
+# the first refresh.
+NEWS_SUMMARIZER_WARMUP = os.environ.get('NEWS_SUMMARIZER_WARMUP', '') == '1'
+
+# Seconds cached API responses live; refreshes invalidate them earlier.
+NEWS_RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Summarization engine (news/services/summarizer.py BACKENDS): "transformers"
+# runs the BART model, "extractive" picks sentences with TextRank on the CPU.
+NEWS_SUMMARIZER_BACKEND = os.environ.get('NEWS_SUMMARIZER_BACKEND', 'transformers')
+
+# Transformers models by tier, fastest first. MODEL is a Hugging Face model id
+# or a local directory (set HF_HUB_OFFLINE=1 to never touch the network).
+# Refreshes use the best tier whose SECONDS_PER_STORY estimate (replaced by
+# measured speed once loaded) fits NEWS_REFRESH_LATENCY_BUDGET seconds;
+# `fetch_hn --resummarize` re-runs the latest front page on the quality tier.
+NEWS_SUMMARIZER_TIERS = {
+    'fast': {
+        'MODEL': os.environ.get('NEWS_FAST_MODEL', 'sshleifer/distilbart-cnn-12-6'),
+        'SECONDS_PER_STORY': 0.5,
+    },
+    'quality': {
+        'MODEL': os.environ.get('NEWS_QUALITY_MODEL', 'facebook/bart-large-cnn'),
+        'SECONDS_PER_STORY': 1.5,
+    },
+}
+NEWS_SUMMARIZER_DEFAULT_TIER = 'fast'
+NEWS_REFRESH_LATENCY_BUDGET = float(os.environ.get('NEWS_REFRESH_LATENCY_BUDGET', '30'))
+
+# Options for the transformers backend. With MAP_REDUCE, long articles are
+# summarized in chunks of CHUNK_TOKENS tokens (at most MAX_CHUNKS per article)
+# and the chunk summaries summarized again, instead of truncating the input.
+# CPU_RUNTIME picks how the model runs when no GPU is used: "pytorch"
+# (float32), "quantized" (dynamic int8) or "onnx" (ONNX Runtime, needs
+# optimum[onnxruntime]). Converted models are cached in MODEL_CACHE_DIR.
+NEWS_SUMMARIZER = {
+    'MAP_REDUCE': True,
+    'CHUNK_TOKENS': 1000,
+    'MAX_CHUNKS': 6,
+    'CPU_RUNTIME': os.environ.get('NEWS_SUMMARIZER_CPU_RUNTIME', 'pytorch'),
+}
+if os.environ.get('NEWS_MODEL_CACHE_DIR'):
+    NEWS_SUMMARIZER['MODEL_CACHE_DIR'] = os.environ['NEWS_MODEL_CACHE_DIR']
+
+# Characters of article text kept by the scraper.
+NEWS_ARTICLE_MAX_CHARS = 24_000
+
+# Generated summaries are cached by (input text, model, generation params):
+# MAX_ENTRIES in process memory, plus a SummaryCacheEntry table if PERSIST.
+NEWS_SUMMARY_CACHE = {
+    'MAX_ENTRIES': 1024,
+    'PERSIST': True,
+}
+
+# Where refreshes read the front page: "html" parses news.ycombinator.com,
+# "api" reads the HN Firebase JSON API.
+NEWS_STORY_SOURCE = os.environ.get('NEWS_STORY_SOURCE', 'html')
+
+# Refresh jobs started through the API overlap fetching, summarizing and
+# saving, and commit each story as soon as it is done.
+NEWS_STREAMING_REFRESH = True
+
+# Server-sent event streams of refresh jobs (/api/refresh/<id>/events/) look
+# for progress every POLL_INTERVAL seconds and end after MAX_DURATION seconds,
+# after which browsers reconnect.
+NEWS_EVENT_STREAM = {
+    'POLL_INTERVAL': 1.0,
+    'KEEPALIVE_INTERVAL': 15.0,
+    'MAX_DURATION': 10 * 60,
+}
+
+# Incremental refreshes reuse the cached body of a story that stayed on the
+# front page until the cache entry is this many seconds old.
+NEWS_BODY_REFETCH_AFTER = 6 * 60 * 60
+
+# Shared HTTP client used by the scraper (news/services/http_client.py)
+NEWS_HTTP_CLIENT = {
+    'POOL_CONNECTIONS': 32,  # hosts kept in the connection pool
+    'POOL_MAXSIZE': 4,  # keep-alive connections per host
+    'RETRIES': 2,
+    'BACKOFF_FACTOR': 0.5,
+    'MAX_RESPONSE_BYTES': 5_000_000,
+}
+
 # Simplify logging for local development
 LOGGING = {
     'version': 1,
@@ -0,0 +1,28 @@
+"""Test runner that keeps tests away from the configured response cache."""
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ynews-tests',
+    }
+}
+
+
+class TestRunner(DiscoverRunner):
+    """Run every test on a per-process LocMemCache.
+
+    The configured cache is shared with any server using the same location,
+    and tests clear it and bump its version token.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES=TEST_CACHES)
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)
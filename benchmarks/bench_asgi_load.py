@@ -0,0 +1,182 @@
+"""Load-test the read API under runserver and under gunicorn with Uvicorn workers.
+
+Seeds a throwaway SQLite database and serves it three ways:
+
+- runserver: ``manage.py runserver`` (WSGI, a thread per request) with the
+  DRF views, as the container ran before
+- asgi-drf: ``gunicorn -c backend/gunicorn.conf.py`` with the same DRF views
+- asgi-async: the same server with the async views under ``/api/async/``
+
+Each is hit by ``--clients`` keep-alive connections for ``--seconds`` while
+``--streams`` event streams of a running refresh job stay open, and reports
+requests per second and latency percentiles. Responses are not cached
+(DummyCache), so every request reaches the database.
+
+    python benchmarks/bench_asgi_load.py --clients 32 --seconds 15
+    python benchmarks/bench_asgi_load.py --setups asgi-drf asgi-async --workers 4
+
+Run it on the machine you deploy to: with fewer cores than workers, the
+workers and the load generator compete for the CPU.
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+DB_FILE = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+os.environ['DJANGO_SQLITE_PATH'] = str(DB_FILE)
+os.environ['DJANGO_CACHE_BACKEND'] = 'django.core.cache.backends.dummy.DummyCache'
+# Keep the seeding process from loading a model it never uses.
+os.environ['NEWS_SUMMARIZER_WARMUP'] = ''
+
+from bench_list_endpoints import seed  # noqa: E402  (sets up Django)
+
+from django.core.management import call_command  # noqa: E402
+
+from news.models import Article, RefreshJob  # noqa: E402
+
+SETUPS = ('runserver', 'asgi-drf', 'asgi-async')
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(setup: str, port: int, workers: Optional[int]) -> subprocess.Popen:
+    if setup == 'runserver':
+        command = [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{port}']
+    else:
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'backend/gunicorn.conf.py', 'backend.asgi:application']
+    env = {**os.environ, 'GUNICORN_BIND': f'127.0.0.1:{port}', 'DJANGO_SETTINGS_MODULE': 'backend.settings'}
+    if workers:
+        env['WEB_CONCURRENCY'] = str(workers)
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/api/batches/')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"{setup} did not start on port {port}")
+
+
+def hold_stream(port: int, job_id: int, stop: threading.Event) -> None:
+    """Keep one event stream open, reading it, until ``stop`` is set."""
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        connection.request('GET', f'/api/refresh/{job_id}/events/', headers={'Accept': 'text/event-stream'})
+        response = connection.getresponse()
+        while not stop.is_set():
+            if not response.fp.readline():
+                return
+    except OSError:
+        return
+
+
+def client_loop(port: int, paths: list, stop: threading.Event, samples: list, errors: list) -> None:
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    number = 0
+    while not stop.is_set():
+        path = paths[number % len(paths)]
+        number += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+        except OSError:
+            errors.append(path)
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        if response.status != 200:
+            errors.append(path)
+        samples.append(time.perf_counter() - started)
+
+
+def run_load(setup: str, args, paths: list, job_id: int) -> dict:
+    port = free_port()
+    server = start_server(setup, port, args.workers)
+    stop = threading.Event()
+    streams = [
+        threading.Thread(target=hold_stream, args=(port, job_id, stop), daemon=True) for _ in range(args.streams)
+    ]
+    for stream in streams:
+        stream.start()
+
+    samples, errors = [], []
+    clients = [
+        threading.Thread(target=client_loop, args=(port, paths, stop, samples, errors), daemon=True)
+        for _ in range(args.clients)
+    ]
+    try:
+        for client in clients:
+            client.start()
+        time.sleep(args.seconds)
+    finally:
+        stop.set()
+        for client in clients:
+            client.join(timeout=30)
+        server.terminate()
+        server.wait(timeout=30)
+
+    samples.sort()
+    return {
+        'setup': setup,
+        'requests': len(samples),
+        'rps': len(samples) / args.seconds,
+        'p50': statistics.median(samples) * 1000 if samples else float('nan'),
+        'p99': samples[int(len(samples) * 0.99) - 1] * 1000 if samples else float('nan'),
+        'errors': len(errors),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--setups', nargs='+', choices=SETUPS, default=list(SETUPS))
+    parser.add_argument('--batches', type=int, default=200, help='historical front pages to seed (30 articles each)')
+    parser.add_argument('--clients', type=int, default=32, help='concurrent keep-alive connections')
+    parser.add_argument('--streams', type=int, default=20, help='event streams held open during the run')
+    parser.add_argument('--seconds', type=float, default=15, help='duration of each run')
+    parser.add_argument('--workers', type=int, help='gunicorn worker processes (default: as backend/gunicorn.conf.py)')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    seed(args.batches, with_batches=True)
+    # A job that never finishes keeps the event streams open.
+    job = RefreshJob.objects.create(status=RefreshJob.Status.RUNNING)
+    some_article = Article.objects.order_by('pk').values_list('pk', flat=True)[args.batches // 2]
+    print(f"Seeded {Article.objects.count()} articles in {DB_FILE}")
+
+    rows = []
+    for setup in args.setups:
+        prefix = '/api/async' if setup == 'asgi-async' else '/api'
+        paths = [f'{prefix}/articles/', f'{prefix}/articles/{some_article}/', f'{prefix}/summaries/']
+        rows.append(run_load(setup, args, paths, job.pk))
+
+    print(f"\n{'setup':<12} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for row in rows:
+        print(
+            f"{row['setup']:<12} {row['requests']:>9} {row['rps']:>9.1f} {row['p50']:>9.1f} "
+            f"{row['p99']:>9.1f} {row['errors']:>7}"
+        )
+
+
+if __name__ == '__main__':
+    main()
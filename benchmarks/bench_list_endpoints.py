@@ -0,0 +1,164 @@
+"""Seed a large article history and time the hot read endpoints.
+
+Runs against a throwaway SQLite file, never the project database. The
+endpoints are timed twice: once without the indexes from
+``news/migrations/0006_hot_path_indexes.py`` ("before") and once with them
+("after").
+
+    python benchmarks/bench_list_endpoints.py --batches 1500 --requests 30
+    python benchmarks/bench_list_endpoints.py --no-batches   # legacy scraped_at path
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.pagination import Cursor  # noqa: E402
+
+from news.cache import invalidate_responses  # noqa: E402
+from news.models import Article, BatchEntry, ScrapeBatch, Summary  # noqa: E402
+from news.pagination import SummaryCursorPagination  # noqa: E402
+
+STORIES_PER_BATCH = 30
+INDEXED_MODELS = (Article, Summary)
+
+
+def seed(batches: int, with_batches: bool) -> None:
+    """Create ``batches`` historical front pages of 30 articles, each with a summary."""
+    start = timezone.now() - timedelta(hours=batches)
+    for number in range(batches):
+        scraped_at = start + timedelta(hours=number)
+        articles = Article.objects.bulk_create(
+            [
+                Article(
+                    hn_id=number * STORIES_PER_BATCH + rank,
+                    title=f"Story {number}-{rank}",
+                    url=f"https://example.com/{number}/{rank}",
+                    rank=rank,
+                    points=rank * 3,
+                    content_text="lorem ipsum " * 300,
+                )
+                for rank in range(1, STORIES_PER_BATCH + 1)
+            ]
+        )
+        Article.objects.filter(pk__in=[a.pk for a in articles]).update(scraped_at=scraped_at)
+        summaries = Summary.objects.bulk_create(
+            [Summary(article=article, summary_text="A summary. " * 10, model_name="bench") for article in articles]
+        )
+        Summary.objects.filter(pk__in=[s.pk for s in summaries]).update(generated_at=scraped_at)
+        if with_batches:
+            batch = ScrapeBatch.objects.create(
+                started_at=scraped_at,
+                finished_at=scraped_at + timedelta(seconds=30),
+                story_count=len(articles),
+            )
+            BatchEntry.objects.bulk_create(
+                [BatchEntry(batch=batch, article=article, rank=article.rank) for article in articles]
+            )
+
+
+def set_indexes(enabled: bool) -> None:
+    with connection.schema_editor() as editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                if enabled:
+                    editor.add_index(model, index)
+                else:
+                    editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def deep_summaries_page() -> str:
+    """Cursor URL of a page near the end of the summary history."""
+    paginator = SummaryCursorPagination()
+    paginator.base_url = '/api/summaries/'
+    position = Summary.objects.order_by('-generated_at', '-id').values_list('generated_at', flat=True)[
+        paginator.page_size
+    ]
+    return paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(position)))
+
+
+def time_endpoint(client: Client, path: str, requests: int) -> dict:
+    client.get(path)  # warm caches
+    samples = []
+    for _ in range(requests):
+        # Measure the database path, not the response cache.
+        invalidate_responses()
+        started = time.perf_counter()
+        response = client.get(path)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, (path, response.status_code)
+    samples.sort()
+    return {
+        'median': statistics.median(samples),
+        'p95': samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batches', type=int, default=1500, help='historical front pages to seed (30 articles each)')
+    parser.add_argument('--requests', type=int, default=30, help='timed requests per endpoint')
+    parser.add_argument('--no-batches', action='store_true', help='seed without ScrapeBatch rows (legacy list path)')
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    setup_test_environment()
+    db_file = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+    connection.settings_dict['TEST']['NAME'] = str(db_file)
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    try:
+        started = time.perf_counter()
+        seed(args.batches, with_batches=not args.no_batches)
+        print(
+            f"Seeded {Article.objects.count()} articles and {Summary.objects.count()} summaries "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        some_article = Article.objects.order_by('pk').values_list('pk', flat=True)[args.batches // 2]
+        paths = [
+            '/api/articles/',
+            f'/api/articles/{some_article}/',
+            '/api/summaries/',
+            deep_summaries_page(),
+            '/api/summaries/?model_name=bench&since=2000-01-01',
+        ]
+
+        client = Client()
+        results = {}
+        for label, enabled in (('before', False), ('after', True)):
+            set_indexes(enabled)
+            results[label] = {path: time_endpoint(client, path, args.requests) for path in paths}
+
+        print(f"\n{'endpoint':<60} {'before med/p95 ms':>20} {'after med/p95 ms':>20}")
+        for path in paths:
+            before, after = results['before'][path], results['after'][path]
+            print(
+                f"{path:<60} {before['median']:>9.2f}/{before['p95']:<9.2f} "
+                f"{after['median']:>9.2f}/{after['p95']:<9.2f}"
+            )
+    finally:
+        connection.creation.destroy_test_db(str(db_file), verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Stress SQLite with API readers while refreshes write, with and without tuning.
+
+Each mode runs against a throwaway database next to this script (on disk,
+so commits pay for fsync as they would in production):
+
+- untuned: Django's default SQLite connection (DJANGO_SQLITE_TUNING=0)
+- tuned: WAL, synchronous=NORMAL, busy timeout, larger cache and mmap, and
+  BEGIN IMMEDIATE transactions (backend/database.py)
+
+A writer process saves front pages of 30 stories in one transaction each, as
+a batch refresh does, while a second thread stores summary cache entries
+alongside, as the summarize stage does. Meanwhile ``--readers`` processes
+request the article list and a summaries page. Reported: reader latency,
+failed reads and writes ("database is locked"), and refreshes completed.
+
+    python benchmarks/bench_sqlite_concurrency.py --readers 4 --seconds 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+MODES = ('untuned', 'tuned')
+STORIES_PER_REFRESH = 30
+REFRESH_PAUSE = 0.1
+BODY = "The quick brown fox jumps over the lazy dog. " * 500
+
+
+def refresh_loop(stop: threading.Event, outcome: dict) -> None:
+    from django.db import DatabaseError, close_old_connections, transaction
+    from django.utils import timezone
+
+    from news.models import Article, BatchEntry, ScrapeBatch, Summary
+
+    number = 0
+    while not stop.is_set():
+        number += 1
+        try:
+            with transaction.atomic():
+                batch = ScrapeBatch.objects.create(started_at=timezone.now())
+                for rank in range(1, STORIES_PER_REFRESH + 1):
+                    article, _ = Article.objects.update_or_create(
+                        hn_id=1_000_000 + rank,
+                        defaults={'title': f"Story {rank}", 'rank': rank, 'content_text': f"{number} {BODY}"},
+                    )
+                    Summary.objects.create(article=article, summary_text=f"Summary {number}", model_name="bench")
+                    BatchEntry.objects.create(batch=batch, article=article, rank=rank)
+                batch.finished_at = timezone.now()
+                batch.save(update_fields=['finished_at'])
+            outcome['refreshes'] += 1
+        except DatabaseError as exc:
+            outcome['write_errors'].append(str(exc))
+        finally:
+            close_old_connections()
+        # A real refresh spends most of its time fetching and summarizing
+        # between writes; without a gap it would starve other writers.
+        time.sleep(REFRESH_PAUSE)
+
+
+def cache_writer_loop(stop: threading.Event, outcome: dict) -> None:
+    from django.db import DatabaseError, close_old_connections
+
+    from news.models import SummaryCacheEntry
+
+    number = 0
+    while not stop.is_set():
+        number += 1
+        try:
+            SummaryCacheEntry.objects.bulk_create(
+                [
+                    SummaryCacheEntry(key=f"{number:032d}{index:032d}", model_name="bench", summary_text=BODY[:500])
+                    for index in range(4)
+                ]
+            )
+        except DatabaseError as exc:
+            outcome['write_errors'].append(str(exc))
+        finally:
+            close_old_connections()
+        time.sleep(0.01)
+
+
+def reader_loop(stop: threading.Event, samples: list, errors: list) -> None:
+    from django.db import close_old_connections
+    from django.test import Client
+
+    client = Client()
+    paths = ['/api/articles/', '/api/summaries/']
+    number = 0
+    while not stop.is_set():
+        path = paths[number % len(paths)]
+        number += 1
+        started = time.perf_counter()
+        try:
+            response = client.get(path)
+            ok = response.status_code == 200
+        except Exception as exc:  # noqa: BLE001 - the test client re-raises view errors
+            ok = False
+            errors.append(str(exc))
+        finally:
+            close_old_connections()
+        if ok:
+            samples.append(time.perf_counter() - started)
+
+
+def setup_django(mode: str, db_file: str) -> None:
+    os.environ['DJANGO_SQLITE_PATH'] = db_file
+    os.environ['DJANGO_CACHE_BACKEND'] = 'django.core.cache.backends.dummy.DummyCache'
+    os.environ['DJANGO_SQLITE_TUNING'] = '1' if mode == 'tuned' else '0'
+
+    import django
+
+    django.setup()
+    from django.conf import settings
+
+    settings.DEBUG = False
+
+
+def run_role(role: str, seconds: float) -> dict:
+    """Run one process's share of the load until ``seconds`` have passed."""
+    stop = threading.Event()
+    threading.Timer(seconds, stop.set).start()
+    if role == 'reader':
+        samples, errors = [], []
+        reader_loop(stop, samples, errors)
+        return {'samples': samples, 'read_errors': len(errors)}
+
+    outcome = {'refreshes': 0, 'write_errors': []}
+    cache_writer = threading.Thread(target=cache_writer_loop, args=(stop, outcome))
+    cache_writer.start()
+    refresh_loop(stop, outcome)
+    cache_writer.join()
+    return {'refreshes': outcome['refreshes'], 'write_errors': len(outcome['write_errors'])}
+
+
+def run_mode(mode: str, readers: int, seconds: float) -> dict:
+    db_file = str(Path(tempfile.mkdtemp(dir=Path(__file__).resolve().parent)) / 'bench.sqlite3')
+    base = [sys.executable, __file__, '--mode', mode, '--db', db_file, '--seconds', str(seconds)]
+    subprocess.run(base + ['--role', 'migrate'], check=True)
+    # The writer and each reader are separate processes, like server
+    # workers, so they contend for the database rather than for the GIL.
+    processes = [
+        subprocess.Popen(base + ['--role', role], stdout=subprocess.PIPE, text=True)
+        for role in ['writer'] + ['reader'] * readers
+    ]
+    results = [json.loads(process.communicate()[0].strip().splitlines()[-1]) for process in processes]
+    for leftover in Path(db_file).parent.iterdir():
+        leftover.unlink()
+    Path(db_file).parent.rmdir()
+
+    writer, reader_results = results[0], results[1:]
+    samples = sorted(sample for result in reader_results for sample in result['samples'])
+    return {
+        'mode': mode,
+        'reads': len(samples),
+        'p50_ms': statistics.median(samples) * 1000 if samples else float('nan'),
+        'p99_ms': samples[int(len(samples) * 0.99) - 1] * 1000 if samples else float('nan'),
+        'max_ms': samples[-1] * 1000 if samples else float('nan'),
+        'read_errors': sum(result['read_errors'] for result in reader_results),
+        'write_errors': writer['write_errors'],
+        'refreshes': writer['refreshes'],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--readers', type=int, default=4, help='reader processes')
+    parser.add_argument('--seconds', type=float, default=10, help='duration of each run')
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--role', choices=('migrate', 'writer', 'reader'), help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role:
+        setup_django(args.mode, args.db)
+        if args.role == 'migrate':
+            from django.core.management import call_command
+
+            call_command('migrate', verbosity=0)
+        else:
+            print(json.dumps(run_role(args.role, args.seconds)))
+        return
+
+    rows = [run_mode(mode, args.readers, args.seconds) for mode in args.modes]
+
+    print(
+        f"\n{'mode':<9} {'reads':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+        f"{'read errs':>10} {'write errs':>11} {'refreshes':>10}"
+    )
+    for row in rows:
+        print(
+            f"{row['mode']:<9} {row['reads']:>7} {row['p50_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} "
+            f"{row['read_errors']:>10} {row['write_errors']:>11} {row['refreshes']:>10}"
+        )
+
+
+if __name__ == '__main__':
+    main()
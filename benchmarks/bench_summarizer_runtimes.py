@@ -0,0 +1,107 @@
+"""Compare summarizer latency and memory across CPU runtimes.
+
+Each mode runs in its own subprocess so peak RSS is measured per runtime:
+the float32 PyTorch path, dynamic int8 quantization, ONNX Runtime (needs
+optimum[onnxruntime]) and the extractive backend for reference. The first
+quantized/ONNX run also pays for converting the model; run twice to see the
+cached load time.
+
+    python benchmarks/bench_summarizer_runtimes.py --stories 30 --repeats 3
+    python benchmarks/bench_summarizer_runtimes.py --modes pytorch quantized
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+MODES = ('pytorch', 'quantized', 'onnx', 'extractive')
+
+PARAGRAPH = (
+    "The city council approved a plan on Monday to replace the aging water mains under the downtown district. "
+    "Engineers said the pipes, some more than a century old, have burst eleven times in the past two years. "
+    "Construction will close two lanes of Main Street for roughly eighteen months starting in the spring. "
+    "Business owners worried that the detours would keep customers away during the busiest season. "
+    "The council set aside a small grant fund to help shops that can show a drop in sales. "
+    "Residents will be notified a week before water service in their block is interrupted. "
+)
+
+
+def sample_texts(stories: int) -> list:
+    """Article-sized inputs of varying length, a few paragraphs each."""
+    return [f"Story {number}. " + PARAGRAPH * (2 + number % 5) for number in range(stories)]
+
+
+def run_child(mode: str, stories: int, repeats: int) -> dict:
+    import django
+
+    django.setup()
+    from news.services.summarizer import ExtractiveSummarizer, LocalSummarizer
+
+    started = time.perf_counter()
+    if mode == 'extractive':
+        summarizer = ExtractiveSummarizer()
+    else:
+        # No summary cache: every repeat must run the model.
+        summarizer = LocalSummarizer(device='cpu', cpu_runtime=mode)
+    load_seconds = time.perf_counter() - started
+
+    texts = sample_texts(stories)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        results = summarizer.summarize_batch(texts)
+        samples.append(time.perf_counter() - started)
+
+    return {
+        'mode': mode,
+        'model_name': results[0].model_name,
+        'load_seconds': load_seconds,
+        'batch_seconds': statistics.median(samples),
+        # ru_maxrss is kilobytes on Linux and bytes on macOS.
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--stories', type=int, default=30, help='inputs summarized per batch')
+    parser.add_argument('--repeats', type=int, default=3, help='timed batches per mode (median is reported)')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.stories, args.repeats)))
+        return
+
+    rows = []
+    for mode in args.modes:
+        completed = subprocess.run(
+            [sys.executable, __file__, '--child', mode, '--stories', str(args.stories), '--repeats', str(args.repeats)],
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            print(f"{mode}: failed\n{completed.stderr.strip()}", file=sys.stderr)
+            continue
+        rows.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"\n{'mode':<12} {'model':<36} {'load s':>8} {'batch s':>9} {'per story ms':>13} {'peak RSS MB':>12}")
+    for row in rows:
+        print(
+            f"{row['mode']:<12} {row['model_name']:<36} {row['load_seconds']:>8.2f} {row['batch_seconds']:>9.2f} "
+            f"{row['batch_seconds'] / args.stories * 1000:>13.1f} {row['peak_rss_mb']:>12.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
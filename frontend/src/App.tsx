@@ -10,11 +10,13 @@ import {
 
 import { ArticlesTable } from "@/components/articles-table";
 import { Button } from "@/components/ui/button";
-import { API_BASE, fetchArticles, triggerRefresh } from "@/lib/api";
+import { API_BASE, fetchArticles, refreshAndWait } from "@/lib/api";
+import type { Article, Paginated, RefreshJob, SummaryEvent } from "@/types";
 
 function App() {
   const queryClient = useQueryClient();
   const [error, setError] = useState<string | null>(null);
+  const [progress, setProgress] = useState<RefreshJob | null>(null);
 
   // Fetch articles with React Query - auto-refetch every 1 hour (3600000ms)
   const { data, isLoading } = useQuery({
@@ -27,16 +29,35 @@ function App() {
 
   const articles = useMemo(() => data?.results || [], [data?.results]);
 
+  // Show summaries pushed by the refresh stream on listed articles as they
+  // arrive, without re-fetching the list. Events come oldest first, so the
+  // last one for an article is its newest summary.
+  const showSummary = (summary: SummaryEvent) => {
+    queryClient.setQueryData<Paginated<Article>>(["articles"], (page) =>
+      page && {
+        ...page,
+        results: page.results.map((article) =>
+          article.id === summary.article
+            ? { ...article, latest_summary: summary }
+            : article,
+        ),
+      },
+    );
+  };
+
   // Mutation for manual refresh
   const refreshMutation = useMutation({
-    mutationFn: triggerRefresh,
+    mutationFn: () =>
+      refreshAndWait({ onProgress: setProgress, onSummary: showSummary }),
     onSuccess: () => {
+      // The new front page is listed once the refresh has finished.
       queryClient.invalidateQueries({ queryKey: ["articles"] });
       setError(null);
     },
     onError: (err) => {
       setError(err instanceof Error ? err.message : "Refresh failed");
     },
+    onSettled: () => setProgress(null),
   });
 
   const handleRefresh = () => {
@@ -80,7 +101,11 @@ function App() {
               ) : (
                 <RefreshCw className="h-4 w-4" />
               )}
-              {refreshMutation.isPending ? "Refreshing…" : "Refresh now"}
+              {refreshMutation.isPending
+                ? progress?.status === "running"
+                  ? `Summarized ${progress.stories_summarized}/${progress.limit}`
+                  : "Refreshing…"
+                : "Refresh now"}
             </Button>
             <Button variant="outline" asChild>
               <a
@@ -1,4 +1,4 @@
-import type { Article, Paginated } from "@/types";
+import type { Article, Paginated, RefreshJob, SummaryEvent } from "@/types";
 
 export const API_BASE = (
   import.meta.env.VITE_API_BASE || "http://localhost:8000"
@@ -12,12 +12,59 @@ async function handleResponse<T>(response: Response): Promise<T> {
   return response.json() as Promise<T>;
 }
 
+// The async view of /api/articles/: same data, served without tying up a
+// worker thread under the ASGI server.
 export async function fetchArticles(): Promise<Paginated<Article>> {
-  const res = await fetch(`${API_BASE}/api/articles/`);
+  const res = await fetch(`${API_BASE}/api/async/articles/`);
   return handleResponse<Paginated<Article>>(res);
 }
 
-export async function triggerRefresh(): Promise<void> {
+export async function triggerRefresh(): Promise<RefreshJob> {
   const res = await fetch(`${API_BASE}/api/refresh/`, { method: "POST" });
-  await handleResponse(res);
+  return handleResponse<RefreshJob>(res);
+}
+
+export async function fetchRefreshJob(id: number): Promise<RefreshJob> {
+  const res = await fetch(`${API_BASE}/api/refresh/${id}/`);
+  return handleResponse<RefreshJob>(res);
+}
+
+export interface RefreshHandlers {
+  onProgress?: (job: RefreshJob) => void;
+  onSummary?: (summary: SummaryEvent) => void;
+}
+
+// Queue a refresh (or join the running one), follow its event stream and
+// resolve once it finishes. Summaries are reported as they are written.
+export async function refreshAndWait(
+  handlers: RefreshHandlers = {},
+): Promise<RefreshJob> {
+  const job = await triggerRefresh();
+  handlers.onProgress?.(job);
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE}/api/refresh/${job.id}/events/`);
+    source.addEventListener("progress", (event) => {
+      handlers.onProgress?.(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("summary", (event) => {
+      handlers.onSummary?.(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("done", (event) => {
+      // Close before the server ends the stream, or EventSource reconnects.
+      source.close();
+      const finished: RefreshJob = JSON.parse((event as MessageEvent).data);
+      if (finished.status === "failed") {
+        reject(new Error(finished.errors.join("\n") || "Refresh failed"));
+      } else {
+        resolve(finished);
+      }
+    });
+    source.onerror = () => {
+      // EventSource retries dropped connections by itself; give up only
+      // once it has stopped trying.
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error("Lost connection to the refresh stream"));
+      }
+    };
+  });
 }
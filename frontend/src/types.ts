@@ -2,9 +2,15 @@ export interface Summary {
   id: number;
   summary_text: string;
   model_name: string;
+  tier: string;
   generated_at: string;
 }
 
+// A summary as pushed by /api/refresh/<id>/events/.
+export interface SummaryEvent extends Summary {
+  article: number;
+}
+
 export interface Article {
   id: number;
   hn_id: number;
@@ -14,12 +20,27 @@ export interface Article {
   points: number;
   comments_count: number;
   rank: number;
-  content_text: string;
+  content_text?: string; // only returned by the detail endpoint
   scraped_at: string;
   posted_at: string | null;
   latest_summary?: Summary | null;
 }
 
+export interface RefreshJob {
+  id: number;
+  status: "queued" | "running" | "succeeded" | "failed";
+  limit: number;
+  source: string;
+  stories_fetched: number;
+  stories_summarized: number;
+  articles_created: number;
+  articles_updated: number;
+  errors: string[];
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface Paginated<T> {
   count: number;
   next: string | null;
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Article, Summary
+from .models import Article, BatchEntry, ScrapeBatch, Summary
 
 
 @admin.register(Article)
@@ -16,4 +16,16 @@ class SummaryAdmin(admin.ModelAdmin):
 	search_fields = ('summary_text',)
 	list_filter = ('model_name', 'generated_at')
 
+
+class BatchEntryInline(admin.TabularInline):
+	model = BatchEntry
+	raw_id_fields = ('article',)
+	extra = 0
+
+
+@admin.register(ScrapeBatch)
+class ScrapeBatchAdmin(admin.ModelAdmin):
+	list_display = ('id', 'started_at', 'finished_at', 'story_count', 'created_count', 'summarized_count')
+	inlines = [BatchEntryInline]
+
 # Register your models here.
@@ -1,6 +1,18 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class NewsConfig(AppConfig):
     name = 'news'
     default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if getattr(settings, 'NEWS_SUMMARIZER_WARMUP', False):
+            from .services.summarizer import warm_up
+
+            # Load the model in the background so startup is not blocked.
+            threading.Thread(target=warm_up, name='summarizer-warmup', daemon=True).start()
@@ -0,0 +1,128 @@
+"""Response caching for the read API.
+
+Cached responses are keyed on a data version stored in the cache itself.
+Any write to articles or summaries replaces the version, so stale entries
+are never read again and simply expire.
+"""
+
+import hashlib
+import time
+import uuid
+from typing import Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'news:data-version'
+
+
+def _new_version() -> Tuple[str, float]:
+    return uuid.uuid4().hex, time.time()
+
+
+def get_data_version() -> Tuple[str, float]:
+    """Return ``(token, changed_at)`` for the current article data."""
+    return cache.get_or_set(VERSION_KEY, _new_version, None)
+
+
+async def aget_data_version() -> Tuple[str, float]:
+    return await cache.aget_or_set(VERSION_KEY, _new_version, None)
+
+
+def invalidate_responses() -> None:
+    cache.set(VERSION_KEY, _new_version(), None)
+
+
+def invalidate_responses_on_commit() -> None:
+    """Invalidate now and again once the surrounding transaction commits.
+
+    The second bump discards anything cached from a read that raced the
+    write and still saw the old rows.
+    """
+    invalidate_responses()
+    transaction.on_commit(invalidate_responses)
+
+
+class CachedResponseMixin:
+    """Serve ``list``/``retrieve`` from the cache with ETag/Last-Modified support."""
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(request, super().retrieve, *args, **kwargs)
+
+    def _cached_response(self, request, render, *args, **kwargs):
+        token, changed_at = get_data_version()
+        etag, last_modified = _validators(request, token, changed_at)
+
+        if not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            key = _response_key(request, token)
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = render(request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    cache.set(key, response.data, getattr(settings, 'NEWS_RESPONSE_CACHE_TIMEOUT', 3600))
+
+        return _with_validators(response, etag, last_modified)
+
+
+async def acached_json_response(request, render) -> HttpResponse:
+    """Async counterpart of :class:`CachedResponseMixin` for plain async views.
+
+    ``render`` is a coroutine function returning the data to send as JSON.
+    """
+    token, changed_at = await aget_data_version()
+    etag, last_modified = _validators(request, token, changed_at)
+
+    if not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+    else:
+        key = _response_key(request, token)
+        data = await cache.aget(key)
+        if data is None:
+            data = await render()
+            await cache.aset(key, data, getattr(settings, 'NEWS_RESPONSE_CACHE_TIMEOUT', 3600))
+        response = JsonResponse(data, safe=False)
+
+    return _with_validators(response, etag, last_modified)
+
+
+def not_modified(request, etag: str, last_modified: int) -> bool:
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def _path_hash(request) -> str:
+    return hashlib.md5(request.get_full_path().encode()).hexdigest()
+
+
+def _validators(request, token: str, changed_at: float) -> Tuple[str, int]:
+    """``(ETag, Last-Modified)`` of ``request``'s URL at data version ``token``."""
+    return quote_etag(f"{token[:16]}-{_path_hash(request)[:16]}"), int(changed_at)
+
+
+def _response_key(request, token: str) -> str:
+    return f"news:response:{token}:{_path_hash(request)}"
+
+
+def _with_validators(response, etag: str, last_modified: int):
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Let browsers and CDNs store the response but revalidate every time.
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
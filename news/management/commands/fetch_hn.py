@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 
-from news.services.pipeline import refresh_top_articles_and_summaries
+from news.services.pipeline import refresh_top_articles_and_summaries, resummarize_latest_batch
+from news.services.scraper import STORY_SOURCES
 
 
 class Command(BaseCommand):
@@ -8,12 +9,51 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--limit', type=int, default=30, help='Number of stories to fetch (default: 30).')
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Re-fetch every article body instead of only new or expired ones.',
+        )
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            help='Overlap fetching and summarizing, saving each story as soon as it is done.',
+        )
+        parser.add_argument(
+            '--source',
+            choices=sorted(STORY_SOURCES),
+            help='Where to read the front page from (default: NEWS_STORY_SOURCE).',
+        )
+        parser.add_argument(
+            '--latency-budget',
+            type=float,
+            help='Seconds summarization may take; picks the summarizer tier (default: NEWS_REFRESH_LATENCY_BUDGET).',
+        )
+        parser.add_argument(
+            '--resummarize',
+            nargs='?',
+            const='quality',
+            metavar='TIER',
+            help='Instead of scraping, re-summarize the latest front page with TIER (default: quality).',
+        )
 
     def handle(self, *args, **options):
         limit = options['limit']
-        result = refresh_top_articles_and_summaries(limit=limit)
+        if options['resummarize']:
+            count = resummarize_latest_batch(options['resummarize'], limit=limit)
+            self.stdout.write(self.style.SUCCESS(f"Done. resummarized={count} tier={options['resummarize']}"))
+            return
+
+        result = refresh_top_articles_and_summaries(
+            limit=limit,
+            incremental=not options['full'],
+            latency_budget=options['latency_budget'],
+            source=options['source'],
+            streaming=options['stream'],
+        )
         self.stdout.write(
             self.style.SUCCESS(
-                f"Done. created={result.created} updated={result.updated} summarized={result.summarized}"
+                f"Done. created={result.created} updated={result.updated} "
+                f"bodies_fetched={result.bodies_fetched} summarized={result.summarized}"
             )
         )
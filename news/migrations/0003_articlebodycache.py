@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-17 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_article_created_at_alter_article_scraped_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleBodyCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=1000, unique=True)),
+                ('etag', models.CharField(blank=True, max_length=500)),
+                ('last_modified', models.CharField(blank=True, max_length=100)),
+                ('content_hash', models.CharField(blank=True, max_length=64)),
+                ('content_text', models.TextField(blank=True)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name='summary',
+            options={'ordering': ['generated_at']},
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_articlebodycache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('active', models.BooleanField(default=True, editable=False, null=True, unique=True)),
+                ('limit', models.PositiveIntegerField(default=30)),
+                ('stories_fetched', models.PositiveIntegerField(default=0)),
+                ('stories_summarized', models.PositiveIntegerField(default=0)),
+                ('articles_created', models.PositiveIntegerField(default=0)),
+                ('articles_updated', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
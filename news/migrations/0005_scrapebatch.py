@@ -0,0 +1,56 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_refreshjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('comments_count', models.PositiveIntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_entries', to='news.article')),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScrapeBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('story_count', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('updated_count', models.PositiveIntegerField(default=0)),
+                ('summarized_count', models.PositiveIntegerField(default=0)),
+                ('articles', models.ManyToManyField(related_name='batches', through='news.BatchEntry', to='news.article')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='batchentry',
+            name='batch',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='news.scrapebatch'),
+        ),
+        migrations.AddIndex(
+            model_name='batchentry',
+            index=models.Index(fields=['batch', 'rank'], name='batchentry_batch_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='batchentry',
+            constraint=models.UniqueConstraint(fields=('batch', 'article'), name='unique_article_per_batch'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_scrapebatch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['scraped_at', 'rank'], name='article_scraped_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='summary',
+            index=models.Index(fields=['article', 'generated_at', 'id'], name='summary_article_generated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='summary',
+            index=models.Index(fields=['generated_at', 'id'], name='summary_generated_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='summary',
+            index=models.Index(fields=['model_name', 'generated_at', 'id'], name='summary_model_generated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_summary_model_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summary',
+            name='content_fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_summarycacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summary',
+            name='tier',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
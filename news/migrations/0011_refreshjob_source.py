@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0010_summary_tier'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refreshjob',
+            name='source',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
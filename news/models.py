@@ -1,4 +1,21 @@
 from django.db import models
+from django.utils import timezone
+
+
+class ArticleQuerySet(models.QuerySet):
+	def with_latest_summary(self):
+		"""Prefetch each article's newest summary in one extra query.
+
+		The result lands in ``latest_summaries`` (a list of at most one
+		summary), which ``ArticleSerializer`` reads instead of querying.
+		"""
+		return self.prefetch_related(
+			models.Prefetch(
+				'summaries',
+				queryset=Summary.objects.order_by('-generated_at', '-id')[:1],
+				to_attr='latest_summaries',
+			)
+		)
 
 
 class Article(models.Model):
@@ -15,8 +32,16 @@ class Article(models.Model):
 	posted_at = models.DateTimeField(null=True, blank=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	objects = ArticleQuerySet.as_manager()
+
 	class Meta:
 		ordering = ['rank', '-points']
+		indexes = [
+			# Only the legacy front page uses this (data scraped before batches
+			# existed): Max(scraped_at), then a range scan ordered by rank. The
+			# list normally reads a batch's entries instead.
+			models.Index(fields=['scraped_at', 'rank'], name='article_scraped_rank_idx'),
+		]
 
 	def __str__(self) -> str:  # pragma: no cover - convenience
 		return f"{self.rank}. {self.title}" if self.rank else self.title
@@ -26,12 +51,126 @@ class Summary(models.Model):
 	article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='summaries')
 	summary_text = models.TextField()
 	model_name = models.CharField(max_length=200, default='local-gpu')
+	# Summarizer tier (NEWS_SUMMARIZER_TIERS) that produced it; empty for
+	# fallbacks, the extractive backend and older summaries.
+	tier = models.CharField(max_length=20, blank=True)
+	# Hash of the normalized text that was summarized; empty for summaries
+	# written before fingerprints existed.
+	content_fingerprint = models.CharField(max_length=64, blank=True)
 	generated_at = models.DateTimeField(auto_now_add=True)
 
 	class Meta:
 		ordering = ['generated_at']
+		indexes = [
+			# Per-article summary lookups (latest_summary prefetch, refresh checks).
+			models.Index(fields=['article', 'generated_at', 'id'], name='summary_article_generated_idx'),
+			# Chronological listing of /api/summaries/.
+			models.Index(fields=['generated_at', 'id'], name='summary_generated_idx'),
+			# /api/summaries/?model_name=... pages.
+			models.Index(fields=['model_name', 'generated_at', 'id'], name='summary_model_generated_idx'),
+		]
 
 	def __str__(self) -> str:  # pragma: no cover - convenience
 		return f"Summary for {self.article_id} ({self.model_name})"
 
+
+class ScrapeBatch(models.Model):
+	"""One refresh of the front page; its entries record the ranking at that time."""
+
+	started_at = models.DateTimeField()
+	finished_at = models.DateTimeField(null=True, blank=True, db_index=True)
+	story_count = models.PositiveIntegerField(default=0)
+	created_count = models.PositiveIntegerField(default=0)
+	updated_count = models.PositiveIntegerField(default=0)
+	summarized_count = models.PositiveIntegerField(default=0)
+	articles = models.ManyToManyField(Article, through='BatchEntry', related_name='batches')
+
+	class Meta:
+		ordering = ['-started_at']
+
+	def __str__(self) -> str:  # pragma: no cover - convenience
+		return f"Batch {self.pk} ({self.started_at:%Y-%m-%d %H:%M})"
+
+
+class BatchEntry(models.Model):
+	batch = models.ForeignKey(ScrapeBatch, on_delete=models.CASCADE, related_name='entries')
+	article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='batch_entries')
+	rank = models.PositiveIntegerField()
+	points = models.PositiveIntegerField(default=0)
+	comments_count = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		ordering = ['rank']
+		constraints = [
+			models.UniqueConstraint(fields=['batch', 'article'], name='unique_article_per_batch'),
+		]
+		indexes = [
+			models.Index(fields=['batch', 'rank'], name='batchentry_batch_rank_idx'),
+		]
+
+
+class ArticleBodyCache(models.Model):
+	"""Last fetched body of an article URL, used for conditional GETs."""
+
+	url = models.URLField(max_length=1000, unique=True)
+	etag = models.CharField(max_length=500, blank=True)
+	last_modified = models.CharField(max_length=100, blank=True)
+	content_hash = models.CharField(max_length=64, blank=True)
+	content_text = models.TextField(blank=True)
+	fetched_at = models.DateTimeField(auto_now=True)
+
+	def __str__(self) -> str:  # pragma: no cover - convenience
+		return self.url
+
+
+class SummaryCacheEntry(models.Model):
+	"""Persistent tier of the summary cache (news/services/summary_cache.py).
+
+	``key`` hashes the normalized input text, the model name and the
+	generation parameters, so identical inputs are only summarized once.
+	"""
+
+	key = models.CharField(max_length=64, unique=True)
+	model_name = models.CharField(max_length=200)
+	summary_text = models.TextField()
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	def __str__(self) -> str:  # pragma: no cover - convenience
+		return self.key
+
+
+class RefreshJob(models.Model):
+	"""A scrape + summarize run requested through the API."""
+
+	class Status(models.TextChoices):
+		QUEUED = 'queued'
+		RUNNING = 'running'
+		SUCCEEDED = 'succeeded'
+		FAILED = 'failed'
+
+	status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+	# True while queued or running and NULL afterwards; the unique index lets
+	# at most one job be active, so concurrent requests coalesce onto it.
+	active = models.BooleanField(null=True, unique=True, default=True, editable=False)
+	limit = models.PositiveIntegerField(default=30)
+	# A key of STORY_SOURCES; blank means NEWS_STORY_SOURCE.
+	source = models.CharField(max_length=20, blank=True)
+	stories_fetched = models.PositiveIntegerField(default=0)
+	stories_summarized = models.PositiveIntegerField(default=0)
+	articles_created = models.PositiveIntegerField(default=0)
+	articles_updated = models.PositiveIntegerField(default=0)
+	errors = models.JSONField(default=list, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	started_at = models.DateTimeField(null=True, blank=True)
+	finished_at = models.DateTimeField(null=True, blank=True)
+	# Bumped by the runner while the job is alive; an active job whose
+	# heartbeat stops is taken to belong to a dead worker.
+	heartbeat_at = models.DateTimeField(default=timezone.now, editable=False)
+
+	class Meta:
+		ordering = ['-created_at']
+
+	def __str__(self) -> str:  # pragma: no cover - convenience
+		return f"Refresh job {self.pk} ({self.status})"
+
 # Create your models here.
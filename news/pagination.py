@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class SummaryCursorPagination(CursorPagination):
+    """Keyset pagination over ``(generated_at, id)``.
+
+    Each page is an indexed range scan starting after the previous page's
+    last ``generated_at``, so deep pages cost the same as the first one.
+    Rows sharing a timestamp are kept in ``id`` order.
+    """
+
+    ordering = ('generated_at', 'id')
+    page_size = 30
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
@@ -1,20 +1,34 @@
 from rest_framework import serializers
 
-from .models import Article, Summary
+from .models import Article, RefreshJob, ScrapeBatch, Summary
 
 
-class SummarySerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Limit output to the comma-separated ``?fields=`` of the request, if given."""
+
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request is not None else None
+        if not requested:
+            return names
+        wanted = {name.strip() for name in requested.split(',')}
+        return [name for name in names if name in wanted]
+
+
+class SummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Summary
         fields = [
             'id',
             'summary_text',
             'model_name',
+            'tier',
             'generated_at',
         ]
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     latest_summary = serializers.SerializerMethodField()
 
     class Meta:
@@ -35,6 +49,57 @@ class ArticleSerializer(serializers.ModelSerializer):
             'latest_summary',
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Articles listed for a scrape batch report the numbers from that batch.
+        for field, attr in (('rank', 'batch_rank'), ('points', 'batch_points'), ('comments_count', 'batch_comments_count')):
+            if field in data and hasattr(instance, attr):
+                data[field] = getattr(instance, attr)
+        return data
+
     def get_latest_summary(self, obj: Article):
-        summary = obj.summaries.order_by('generated_at').first()
+        if hasattr(obj, 'latest_summaries'):
+            summary = obj.latest_summaries[0] if obj.latest_summaries else None
+        else:
+            summary = obj.summaries.order_by('-generated_at', '-id').first()
         return SummarySerializer(summary).data if summary else None
+
+
+class ArticleListSerializer(ArticleSerializer):
+    """List representation without ``content_text``; the detail endpoint has it."""
+
+    class Meta(ArticleSerializer.Meta):
+        fields = [name for name in ArticleSerializer.Meta.fields if name != 'content_text']
+
+
+class RefreshJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RefreshJob
+        fields = [
+            'id',
+            'status',
+            'limit',
+            'source',
+            'stories_fetched',
+            'stories_summarized',
+            'articles_created',
+            'articles_updated',
+            'errors',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+
+
+class ScrapeBatchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScrapeBatch
+        fields = [
+            'id',
+            'started_at',
+            'finished_at',
+            'story_count',
+            'created_count',
+            'updated_count',
+            'summarized_count',
+        ]
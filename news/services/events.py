@@ -0,0 +1,141 @@
+"""Server-sent event stream of a refresh job.
+
+The job may run in another worker process, so the stream follows it through
+the database: every ``poll_interval`` seconds it reads the job row and any
+summaries written since the last look. That is two small indexed queries per
+open stream, instead of every tab re-fetching the article list.
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..models import RefreshJob, Summary
+from ..serializers import RefreshJobSerializer, SummarySerializer
+
+POLL_INTERVAL = 1.0
+# Comment lines keep proxies from closing an idle connection.
+KEEPALIVE_INTERVAL = 15.0
+# Streams end after this many seconds; EventSource reconnects by itself.
+MAX_DURATION = 10 * 60
+# Tells EventSource how long to wait before reconnecting, in milliseconds.
+RETRY_MS = 2000
+
+FINISHED_STATUSES = (RefreshJob.Status.SUCCEEDED, RefreshJob.Status.FAILED)
+
+
+def format_event(event: str, data: object, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def summary_payload(summary: Summary) -> dict:
+    return {**SummarySerializer(summary).data, 'article': summary.article_id}
+
+
+def stream_options() -> dict:
+    defaults = {
+        'poll_interval': POLL_INTERVAL,
+        'keepalive_interval': KEEPALIVE_INTERVAL,
+        'max_duration': MAX_DURATION,
+    }
+    overrides = getattr(settings, 'NEWS_EVENT_STREAM', {})
+    return {**defaults, **{key.lower(): value for key, value in overrides.items()}}
+
+
+class RefreshEventStream:
+    """``progress`` and ``summary`` events for a job until a final ``done``.
+
+    ``progress`` carries the job whenever its counters change and ``summary``
+    each summary written since the job was created, with the summary id as
+    the event id. A reconnecting client sends the last id it saw and only
+    gets the summaries after it.
+
+    Iterate it synchronously under WSGI and with ``async for`` under ASGI:
+    Django buffers the whole of a sync iterator before serving it over ASGI.
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        last_event_id: Optional[int] = None,
+        poll_interval: float = POLL_INTERVAL,
+        keepalive_interval: float = KEEPALIVE_INTERVAL,
+        max_duration: float = MAX_DURATION,
+    ) -> None:
+        self.job_id = job_id
+        self.poll_interval = poll_interval
+        self.keepalive_interval = keepalive_interval
+        self.max_duration = max_duration
+        self._last_summary_id = last_event_id
+        self._last_progress = None
+        self._started = self._last_sent = 0.0
+
+    def __iter__(self) -> Iterator[str]:
+        yield self._start()
+        job = RefreshJob.objects.get(pk=self.job_id)
+        while True:
+            text, finished = self._events(job, list(self._new_summaries(job)))
+            if text:
+                yield text
+            if finished or self._expired():
+                return
+            time.sleep(self.poll_interval)
+            job.refresh_from_db()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        yield self._start()
+        job = await RefreshJob.objects.aget(pk=self.job_id)
+        while True:
+            text, finished = self._events(job, [summary async for summary in self._new_summaries(job)])
+            if text:
+                yield text
+            if finished or self._expired():
+                return
+            await asyncio.sleep(self.poll_interval)
+            await job.arefresh_from_db()
+
+    def _start(self) -> str:
+        self._started = self._last_sent = time.monotonic()
+        return f"retry: {RETRY_MS}\n\n"
+
+    def _new_summaries(self, job: RefreshJob):
+        if self._last_summary_id is None:
+            summaries = Summary.objects.filter(generated_at__gte=job.created_at)
+        else:
+            summaries = Summary.objects.filter(id__gt=self._last_summary_id)
+        return summaries.order_by('id')
+
+    def _events(self, job: RefreshJob, summaries: List[Summary]) -> Tuple[str, bool]:
+        """The text to send for one look at the job, and whether the stream is over."""
+        chunks = []
+        progress = RefreshJobSerializer(job).data
+        if progress != self._last_progress:
+            chunks.append(format_event('progress', progress))
+            self._last_progress = progress
+        for summary in summaries:
+            chunks.append(format_event('summary', summary_payload(summary), summary.pk))
+            self._last_summary_id = summary.pk
+
+        finished = job.status in FINISHED_STATUSES
+        if finished:
+            # Summaries are committed before the job is marked finished, so
+            # everything has been sent by now.
+            chunks.append(format_event('done', progress))
+
+        now = time.monotonic()
+        if chunks:
+            self._last_sent = now
+        elif now - self._last_sent >= self.keepalive_interval:
+            chunks.append(": keepalive\n\n")
+            self._last_sent = now
+        return "".join(chunks), finished
+
+    def _expired(self) -> bool:
+        return time.monotonic() - self._started >= self.max_duration
@@ -0,0 +1,89 @@
+"""TextRank sentence extraction over TF-IDF vectors.
+
+Cheap enough to summarize a whole front page on a CPU in milliseconds, so it
+serves both as a summarizer backend of its own and as the fallback when the
+transformers model is unavailable.
+"""
+
+import re
+from typing import List
+
+import numpy as np
+
+# Sentences beyond this are ignored; the similarity matrix is quadratic.
+MAX_SENTENCES = 200
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOP_WORDS = frozenset(
+    """
+    a about after all also an and any are as at be been but by can could did do does for from had has have he her
+    his how i if in into is it its just more most no not of on one or our out over she so some than that the their
+    them then there these they this to up was we were what when which who will with would you your
+    """.split()
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text) if sentence.strip()]
+
+
+def rank_sentences(sentences: List[str]) -> np.ndarray:
+    """TextRank score of each sentence, using TF-IDF cosine similarity as edge weights."""
+    count = len(sentences)
+    vocabulary: dict = {}
+    rows = [
+        [vocabulary.setdefault(word, len(vocabulary)) for word in _WORD.findall(sentence.lower()) if word not in STOP_WORDS]
+        for sentence in sentences
+    ]
+    term_counts = np.zeros((count, max(len(vocabulary), 1)))
+    for index, row in enumerate(rows):
+        np.add.at(term_counts[index], row, 1)
+
+    document_frequency = np.count_nonzero(term_counts, axis=0)
+    vectors = term_counts * (np.log((1 + count) / (1 + document_frequency)) + 1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1, norms)
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no words with any other spread their rank evenly.
+    transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1 / count), where=out_weight > 0)
+
+    scores = np.full(count, 1 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def summarize(text: str, max_words: int = 120) -> str:
+    """Highest ranked sentences that fit in ``max_words``, in their original order."""
+    sentences = split_sentences(text)[:MAX_SENTENCES]
+    if not sentences:
+        return ""
+
+    chosen = []
+    words = 0
+    if len(sentences) > 1:
+        # A stable sort keeps earlier sentences ahead on ties.
+        for index in np.argsort(-rank_sentences(sentences), kind="stable"):
+            length = len(sentences[index].split())
+            if words + length <= max_words:
+                chosen.append(index)
+                words += length
+    elif len(sentences[0].split()) <= max_words:
+        chosen = [0]
+
+    if not chosen:
+        # Last resort: truncate by words
+        all_words = text.split()
+        return " ".join(all_words[:max_words]) + ("..." if len(all_words) > max_words else "")
+    return " ".join(sentences[index] for index in sorted(chosen))
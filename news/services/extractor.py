@@ -0,0 +1,99 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Subtrees that never hold article text.
+SKIPPED_TAGS = frozenset(
+    {"nav", "header", "footer", "aside", "script", "style", "noscript", "template", "svg", "iframe", "button"}
+)
+# Block elements whose start implicitly closes an open <p>, as browsers do.
+BLOCK_TAGS = frozenset(
+    {"article", "div", "section", "main", "ul", "ol", "table", "blockquote", "pre", "h1", "h2", "h3", "h4", "h5", "h6"}
+)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w-]+)", re.IGNORECASE)
+
+
+def is_html(content_type: str) -> bool:
+    """True for HTML types and for a missing header, which servers often omit."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return not media_type or media_type in HTML_CONTENT_TYPES
+
+
+def incremental_decoder(declared: Optional[str], first_chunk: bytes) -> codecs.IncrementalDecoder:
+    """Decoder for the header charset, else a ``<meta charset>`` in the first chunk, else UTF-8."""
+    encoding = declared
+    if not encoding:
+        match = _META_CHARSET.search(first_chunk[:2048])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+class ArticleTextExtractor(HTMLParser):
+    """Collects ``<p>`` text from HTML fed in chunks, outside navigation and boilerplate.
+
+    Callers stop feeding once :attr:`done` is set, so only as much of the page
+    is downloaded and parsed as the first ``max_chars`` characters of text need.
+    """
+
+    def __init__(self, max_chars: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.paragraphs: List[str] = []
+        self._chars = 0
+        self._skip_depth = 0
+        self._current: Optional[List[str]] = None
+        self._current_chars = 0
+
+    @property
+    def done(self) -> bool:
+        return self._chars >= self.max_chars
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.paragraphs)[: self.max_chars]
+
+    def close(self) -> None:
+        super().close()
+        self._end_paragraph()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "p" or tag in BLOCK_TAGS:
+            self._end_paragraph()
+            if tag == "p" and not self._skip_depth:
+                self._current = []
+                self._current_chars = 0
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags such as <svg/> open no subtree.
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "p" or tag in BLOCK_TAGS:
+            self._end_paragraph()
+
+    def handle_data(self, data):
+        if self._current is not None and not self._skip_depth:
+            self._current.append(data)
+            self._current_chars += len(data)
+            # Do not wait for </p> when one paragraph alone fills the budget.
+            if self._chars + self._current_chars >= self.max_chars:
+                self._end_paragraph()
+
+    def _end_paragraph(self) -> None:
+        if self._current is None:
+            return
+        text = " ".join("".join(self._current).split())
+        self._current = None
+        if text and not self.done:
+            self.paragraphs.append(text)
+            self._chars += len(text) + 1
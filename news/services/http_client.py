@@ -0,0 +1,182 @@
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Mapping, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "ynews-scraper/0.1 (+https://news.ycombinator.com/)"
+
+logger = logging.getLogger(__name__)
+
+
+def _accept_encoding() -> str:
+    """Advertise only the encodings urllib3 can actually decode here."""
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli  # type: ignore  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # type: ignore  # noqa: F401
+        except ImportError:
+            return ", ".join(encodings)
+    encodings.append("br")
+    return ", ".join(encodings)
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Raised when a response exceeds its byte cap and truncation is not allowed."""
+
+
+@dataclass
+class HttpClientConfig:
+    pool_connections: int = 32
+    pool_maxsize: int = 4
+    retries: int = 2
+    backoff_factor: float = 0.5
+    retry_statuses: tuple = (429, 500, 502, 503, 504)
+    max_response_bytes: int = 5_000_000
+
+    @classmethod
+    def from_settings(cls) -> "HttpClientConfig":
+        overrides = getattr(settings, "NEWS_HTTP_CLIENT", {})
+        return cls(**{key.lower(): value for key, value in overrides.items()})
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    headers: Mapping[str, str] = field(repr=False)
+    content: bytes = field(repr=False)
+    encoding: Optional[str]
+    truncated: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def build_session(config: Optional[HttpClientConfig] = None) -> requests.Session:
+    config = config or HttpClientConfig.from_settings()
+    retry = Retry(
+        total=config.retries,
+        connect=config.retries,
+        read=config.retries,
+        status=config.retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=config.retry_statuses,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": _accept_encoding()})
+    return session
+
+
+_session: Optional[requests.Session] = None
+_config: Optional[HttpClientConfig] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session, _config
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _config = HttpClientConfig.from_settings()
+                _session = build_session(_config)
+    return _session
+
+
+def max_response_bytes() -> int:
+    """The configured ``MAX_RESPONSE_BYTES`` of the process-wide session."""
+    get_session()
+    return _config.max_response_bytes
+
+
+def reset_session() -> None:
+    global _session, _config
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _config = None
+
+
+def fetch(
+    url: str,
+    timeout: float,
+    max_bytes: Optional[int] = None,
+    allow_truncation: bool = False,
+    headers: Optional[Mapping[str, str]] = None,
+) -> FetchResult:
+    """GET ``url`` through the shared session, streaming at most ``max_bytes``.
+
+    Downloads stop as soon as the decoded body passes the cap. With
+    ``allow_truncation`` the prefix read so far is returned, otherwise
+    :class:`ResponseTooLarge` is raised.
+    """
+    limit = max_bytes or max_response_bytes()
+
+    with open_stream(url, timeout=timeout, headers=headers) as response:
+        encoding = declared_encoding(response)
+
+        chunks = []
+        size = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                truncated = True
+                break
+
+        if truncated and not allow_truncation:
+            raise ResponseTooLarge(f"Response from {url} exceeded {limit} bytes", response=response)
+
+        content = b"".join(chunks)[:limit]
+        return FetchResult(
+            url=response.url,
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            encoding=encoding,
+            truncated=truncated,
+        )
+
+
+@contextmanager
+def open_stream(
+    url: str,
+    timeout: float,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Iterator[requests.Response]:
+    """GET ``url`` through the shared session without reading the body.
+
+    Callers can inspect status and headers first and read only as much of
+    ``response.iter_content()`` as they need; the connection goes back to the
+    pool on exit.
+    """
+    with get_session().get(url, timeout=timeout, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        yield response
+
+
+def declared_encoding(response: requests.Response) -> Optional[str]:
+    """The charset from the Content-Type header, or None if the server sent none."""
+    content_type = response.headers.get("Content-Type", "")
+    return response.encoding if "charset" in content_type.lower() else None
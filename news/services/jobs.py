@@ -0,0 +1,112 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections, transaction
+from django.utils import timezone
+
+from ..models import RefreshJob
+from .pipeline import refresh_top_articles_and_summaries
+
+logger = logging.getLogger(__name__)
+
+# Seconds between heartbeats of a running job.
+HEARTBEAT_INTERVAL = 30
+# Active jobs without a heartbeat for this long are assumed to belong to a
+# dead worker process. Queued jobs count from when they were created.
+STALE_JOB_AFTER = timedelta(minutes=5)
+
+# One worker per process: refreshes never run in parallel with each other.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refresh-job")
+
+
+def _expire_stale_jobs() -> None:
+    cutoff = timezone.now() - STALE_JOB_AFTER
+    RefreshJob.objects.filter(active=True, heartbeat_at__lt=cutoff).update(
+        active=None,
+        status=RefreshJob.Status.FAILED,
+        errors=["Job abandoned by its worker"],
+        finished_at=timezone.now(),
+    )
+
+
+def enqueue_refresh(limit: int = 30, source: str = "") -> Tuple[RefreshJob, bool]:
+    """Queue a refresh, or join the one already queued or running.
+
+    ``source`` names the story source (blank for ``NEWS_STORY_SOURCE``); a
+    joined job keeps the source it was started with. Returns the job and
+    whether it was newly created.
+    """
+    _expire_stale_jobs()
+    try:
+        with transaction.atomic():
+            job = RefreshJob.objects.create(limit=limit, source=source)
+            transaction.on_commit(lambda: _executor.submit(run_refresh_job, job.pk))
+    except IntegrityError:
+        active = RefreshJob.objects.filter(active=True).first()
+        if active is None:
+            # The active job finished between our insert and this lookup.
+            return enqueue_refresh(limit, source)
+        return active, False
+    return job, True
+
+
+def _heartbeat(job_id: int, stop: threading.Event) -> None:
+    """Bump the job's ``heartbeat_at`` every ``HEARTBEAT_INTERVAL`` seconds until ``stop`` is set."""
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            RefreshJob.objects.filter(pk=job_id, active=True).update(heartbeat_at=timezone.now())
+    finally:
+        connections.close_all()
+
+
+def run_refresh_job(job_id: int) -> None:
+    close_old_connections()
+    stop_heartbeat = threading.Event()
+    try:
+        now = timezone.now()
+        RefreshJob.objects.filter(pk=job_id).update(
+            status=RefreshJob.Status.RUNNING, started_at=now, heartbeat_at=now
+        )
+        # A separate thread, so a long model call between progress reports
+        # does not make the job look abandoned.
+        threading.Thread(
+            target=_heartbeat, args=(job_id, stop_heartbeat), name="refresh-heartbeat", daemon=True
+        ).start()
+        job = RefreshJob.objects.get(pk=job_id)
+
+        def report(**counts) -> None:
+            RefreshJob.objects.filter(pk=job_id).update(**counts)
+
+        try:
+            result = refresh_top_articles_and_summaries(
+                limit=job.limit,
+                progress=report,
+                source=job.source or None,
+                streaming=getattr(settings, 'NEWS_STREAMING_REFRESH', True),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Refresh job failed", extra={"job_id": job_id})
+            RefreshJob.objects.filter(pk=job_id).update(
+                status=RefreshJob.Status.FAILED,
+                active=None,
+                errors=[str(exc)],
+                finished_at=timezone.now(),
+            )
+            return
+
+        RefreshJob.objects.filter(pk=job_id).update(
+            status=RefreshJob.Status.FAILED if result.errors else RefreshJob.Status.SUCCEEDED,
+            active=None,
+            articles_created=result.created,
+            articles_updated=result.updated,
+            stories_summarized=result.summarized,
+            errors=result.errors,
+            finished_at=timezone.now(),
+        )
+    finally:
+        stop_heartbeat.set()
+        close_old_connections()
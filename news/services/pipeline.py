@@ -1,70 +1,513 @@
 import logging
-from dataclasses import dataclass
-from typing import List
+import queue
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Subquery
 from django.utils import timezone
 
-from ..models import Article, Summary
-from .scraper import Story, fetch_top_stories
-from .summarizer import LocalSummarizer
+from ..cache import invalidate_responses_on_commit
+from ..models import Article, ArticleBodyCache, BatchEntry, ScrapeBatch, Summary
+from .scraper import ArticleBody, Story, fetch_article_bodies, fetch_front_page, iter_article_bodies
+from .summarizer import SummarizerBackend, SummaryResult, get_summarizer, select_tier
+from .summary_cache import content_fingerprint
 
 logger = logging.getLogger(__name__)
 
+ARTICLE_FIELDS = ('title', 'url', 'author', 'points', 'comments_count', 'rank', 'content_text')
+# Streaming refreshes summarize whatever stories are ready, up to this many at
+# a time, so the model starts on the first bodies while the rest download.
+MICRO_BATCH_SIZE = 4
+
+_DONE = object()
+
 
 @dataclass
 class RefreshResult:
     created: int
     updated: int
     summarized: int
+    errors: List[str] = field(default_factory=list)
+    batch_id: Optional[int] = None
+    bodies_fetched: int = 0
+
+
+# Called with keyword counters (``stories_fetched``, ``stories_summarized``)
+# as the refresh moves through its stages.
+ProgressCallback = Callable[..., None]
+
+
+def _load_body_cache(stories: List[Story]) -> Dict[str, ArticleBody]:
+    urls = [story.url for story in stories if story.url]
+    return {
+        entry.url: ArticleBody(
+            text=entry.content_text,
+            content_hash=entry.content_hash,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            changed=False,
+            fetched_at=entry.fetched_at,
+        )
+        for entry in ArticleBodyCache.objects.filter(url__in=urls)
+    }
+
+
+def _summary_input(story: Story) -> str:
+    return story.content_text or story.title
+
+
+def _previous_batch_hn_ids() -> Set[int]:
+    latest = ScrapeBatch.objects.filter(finished_at__isnull=False).order_by('-finished_at').values('id')[:1]
+    return set(BatchEntry.objects.filter(batch_id=Subquery(latest)).values_list('article__hn_id', flat=True))
+
+
+def _stories_to_fetch(stories: List[Story], cache: Dict[str, ArticleBody]) -> List[Story]:
+    """Pick stories whose body must be downloaded for an incremental refresh.
+
+    Stories already on the previous front page reuse their cached body until
+    it is older than ``NEWS_BODY_REFETCH_AFTER`` seconds; new stories are
+    always fetched.
+    """
+    previous = _previous_batch_hn_ids()
+    fresh_after = timezone.now() - timedelta(seconds=getattr(settings, 'NEWS_BODY_REFETCH_AFTER', 6 * 60 * 60))
+
+    to_fetch = []
+    for story in stories:
+        cached = cache.get(story.url)
+        if story.hn_id in previous and cached and cached.fetched_at and cached.fetched_at >= fresh_after:
+            story.body = replace(cached, changed=False)
+            story.content_text = cached.text
+        elif story.url:
+            to_fetch.append(story)
+    return to_fetch
+
+
+def _body_cache_entries(fetched: List[Story]) -> List[ArticleBodyCache]:
+    entries: Dict[str, ArticleBodyCache] = {}
+    for story in fetched:
+        body = story.body
+        if body is None or body.stale or not body.content_hash:
+            continue
+        # Rewritten even when unchanged so fetched_at records the revalidation.
+        entries[story.url] = ArticleBodyCache(
+            url=story.url,
+            etag=body.etag,
+            last_modified=body.last_modified,
+            content_hash=body.content_hash,
+            content_text=body.text,
+        )
+    return list(entries.values())
+
+
+def _summary_fingerprints(stories: List[Story]) -> Dict[int, str]:
+    """Fingerprint of the newest summary, by hn_id, for stories that have one."""
+    article_ids = dict(
+        Article.objects.filter(hn_id__in=[story.hn_id for story in stories]).values_list('hn_id', 'id')
+    )
+    newest: Dict[int, str] = {}
+    for article_id, fingerprint in (
+        Summary.objects.filter(article_id__in=article_ids.values())
+        .order_by('article_id', '-generated_at', '-id')
+        .values_list('article_id', 'content_fingerprint')
+    ):
+        newest.setdefault(article_id, fingerprint)
+    return {hn_id: newest[article_id] for hn_id, article_id in article_ids.items() if article_id in newest}
+
 
+def _needs_summary(story: Story, fingerprints: Dict[int, str], cache: Dict[str, ArticleBody]) -> bool:
+    """True for a story without a summary, or whose content fingerprint changed.
 
-@transaction.atomic
-def refresh_top_articles_and_summaries(limit: int = 30) -> RefreshResult:
+    A story whose body could not be fetched keeps its existing summary
+    rather than being re-summarized from its title.
+    """
+    if story.hn_id not in fingerprints:
+        return True
+    if story.url and not story.content_text:
+        return False
+    previous = fingerprints[story.hn_id]
+    if previous:
+        return previous != content_fingerprint(_summary_input(story))
+    # Summaries written before fingerprints: rely on the body hash.
+    return story.url in cache and story.body is not None and story.body.changed
+
+
+def _stories_needing_summary(stories: List[Story], cache: Dict[str, ArticleBody]) -> List[Story]:
+    fingerprints = _summary_fingerprints(stories)
+    return [story for story in stories if _needs_summary(story, fingerprints, cache)]
+
+
+def _upsert_body_cache(entries: List[ArticleBodyCache]) -> None:
+    if entries:
+        ArticleBodyCache.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['url'],
+            update_fields=['etag', 'last_modified', 'content_hash', 'content_text', 'fetched_at'],
+        )
+
+
+def _persist(
+    stories: List[Story],
+    summaries: Dict[int, SummaryResult],
+    body_cache_entries: List[ArticleBodyCache],
+    started_at: datetime,
+) -> RefreshResult:
+    """Write one refresh in a single short transaction using bulk statements."""
+    now = timezone.now()
+    fields = list(ARTICLE_FIELDS)
+
+    with transaction.atomic():
+        existing = Article.objects.in_bulk([story.hn_id for story in stories], field_name='hn_id')
+        new_articles = []
+        changed_articles = []
+        for story in stories:
+            article = existing.get(story.hn_id) or Article(hn_id=story.hn_id)
+            for name in fields:
+                setattr(article, name, getattr(story, name))
+            article.scraped_at = now
+            article.updated_at = now
+            (changed_articles if article.pk else new_articles).append(article)
+
+        Article.objects.bulk_create(new_articles)
+        Article.objects.bulk_update(changed_articles, fields + ['scraped_at', 'updated_at'])
+
+        _upsert_body_cache(body_cache_entries)
+
+        article_ids = dict(
+            Article.objects.filter(hn_id__in=[story.hn_id for story in stories]).values_list('hn_id', 'id')
+        )
+        if summaries:
+            inputs = {story.hn_id: _summary_input(story) for story in stories}
+            Summary.objects.bulk_create(
+                [
+                    Summary(
+                        article_id=article_ids[hn_id],
+                        summary_text=result.text,
+                        model_name=result.model_name,
+                        tier=result.tier,
+                        content_fingerprint=content_fingerprint(inputs[hn_id]),
+                    )
+                    for hn_id, result in summaries.items()
+                ]
+            )
+
+        batch = ScrapeBatch.objects.create(
+            started_at=started_at,
+            finished_at=timezone.now(),
+            story_count=len(stories),
+            created_count=len(new_articles),
+            updated_count=len(changed_articles),
+            summarized_count=len(summaries),
+        )
+        BatchEntry.objects.bulk_create(
+            [
+                BatchEntry(
+                    batch=batch,
+                    article_id=article_ids[story.hn_id],
+                    rank=story.rank,
+                    points=story.points,
+                    comments_count=story.comments_count,
+                )
+                for story in stories
+            ]
+        )
+        # Bulk writes skip model signals, so invalidate cached responses here.
+        invalidate_responses_on_commit()
+
+    return RefreshResult(
+        created=len(new_articles),
+        updated=len(changed_articles),
+        summarized=len(summaries),
+        batch_id=batch.pk,
+    )
+
+
+def refresh_top_articles_and_summaries(
+    limit: int = 30,
+    progress: Optional[ProgressCallback] = None,
+    incremental: bool = True,
+    latency_budget: Optional[float] = None,
+    source: Optional[str] = None,
+    streaming: bool = False,
+) -> RefreshResult:
+    """Scrape, summarize and store the front page in three stages.
+
+    Network I/O and model inference run outside any transaction; only the
+    final persist stage holds the database write lock, and only briefly.
+    An ``incremental`` refresh only downloads bodies of stories that are new
+    since the previous batch or whose cached body has expired. The summarizer
+    tier is the best one expected to finish within ``latency_budget`` seconds
+    (default ``NEWS_REFRESH_LATENCY_BUDGET``). ``source`` names the story
+    source (default ``NEWS_STORY_SOURCE``).
+
+    With ``streaming`` the three stages overlap and every story is committed
+    as soon as it is summarized; see :func:`_refresh_streaming`.
+    """
+    report = progress or (lambda **counts: None)
+    started_at = timezone.now()
+
+    # Stage 1: fetch.
     try:
-        stories: List[Story] = fetch_top_stories(limit=limit)
+        stories: List[Story] = fetch_front_page(limit=limit, source=source)
     except Exception as exc:  # noqa: BLE001
         logger.error("Scrape failed", extra={"error": str(exc)})
-        return RefreshResult(created=0, updated=0, summarized=0)
-    summarizer = LocalSummarizer()
+        return RefreshResult(created=0, updated=0, summarized=0, errors=[f"Scrape failed: {exc}"])
 
-    created = 0
-    updated = 0
-    summarized = 0
+    if not stories:
+        # Keep the previous batch as the latest front page.
+        logger.error("Scrape returned no stories")
+        return RefreshResult(created=0, updated=0, summarized=0, errors=["Scrape returned no stories"])
 
-    for story in stories:
-        article, created_flag = Article.objects.update_or_create(
-            hn_id=story.hn_id,
-            defaults={
-                'title': story.title,
-                'url': story.url,
-                'author': story.author,
-                'points': story.points,
-                'comments_count': story.comments_count,
-                'rank': story.rank,
-                'content_text': story.content_text,
-                'scraped_at': timezone.now(),
-            },
-        )
+    body_cache = _load_body_cache(stories)
+    to_fetch = _stories_to_fetch(stories, body_cache) if incremental else [s for s in stories if s.url]
+    if latency_budget is None:
+        latency_budget = getattr(settings, 'NEWS_REFRESH_LATENCY_BUDGET', None)
+    if streaming:
+        # Bodies are not in yet: size the tier for the stories without a
+        # summary and those whose cached text already changed, assuming
+        # re-downloaded bodies are unchanged.
+        expected = _stories_needing_summary(stories, body_cache)
+        summarizer = get_summarizer(select_tier(len(expected), latency_budget))
+        return _refresh_streaming(stories, body_cache, to_fetch, summarizer, report, started_at)
 
-        created += 1 if created_flag else 0
-        updated += 0 if created_flag else 1
+    fetch_article_bodies(to_fetch, cache=body_cache)
+    report(stories_fetched=len(stories))
 
-        # Generate a summary when one does not exist for this scrape cycle.
-        latest = article.summaries.order_by('-generated_at').first()
-        if latest:
-            continue
+    # Stage 2: summarize.
+    to_summarize = _stories_needing_summary(stories, body_cache)
+    summaries: Dict[int, SummaryResult] = {}
+    if to_summarize:
+        summarizer = get_summarizer(select_tier(len(to_summarize), latency_budget))
+        results = summarizer.summarize_batch([_summary_input(story) for story in to_summarize])
+        summaries = {story.hn_id: result for story, result in zip(to_summarize, results)}
+    report(stories_summarized=len(summaries))
+
+    # Stage 3: persist.
+    result = _persist(stories, summaries, _body_cache_entries(to_fetch), started_at)
+    result.bodies_fetched = len(to_fetch)
 
-        summary_result = summarizer.summarize(article.content_text or article.title)
-        Summary.objects.create(
+    logger.info(
+        "Refreshed top stories",
+        extra={
+            "bodies_fetched": result.bodies_fetched,
+            "articles_created": result.created,
+            "articles_updated": result.updated,
+            "summaries_generated": result.summarized,
+        },
+    )
+    return result
+
+
+def _persist_story(batch: ScrapeBatch, story: Story, summary: Optional[SummaryResult], fetched: bool) -> bool:
+    """Commit one story with its summary and batch entry. Returns True if the article is new."""
+    with transaction.atomic():
+        article, created = Article.objects.update_or_create(
+            hn_id=story.hn_id, defaults={name: getattr(story, name) for name in ARTICLE_FIELDS}
+        )
+        if fetched:
+            _upsert_body_cache(_body_cache_entries([story]))
+        if summary is not None:
+            Summary.objects.create(
+                article=article,
+                summary_text=summary.text,
+                model_name=summary.model_name,
+                tier=summary.tier,
+                content_fingerprint=content_fingerprint(_summary_input(story)),
+            )
+        BatchEntry.objects.create(
+            batch=batch,
             article=article,
-            summary_text=summary_result.text,
-            model_name=summary_result.model_name,
+            rank=story.rank,
+            points=story.points,
+            comments_count=story.comments_count,
+        )
+    return created
+
+
+def _refresh_streaming(
+    stories: List[Story],
+    body_cache: Dict[str, ArticleBody],
+    to_fetch: List[Story],
+    summarizer: SummarizerBackend,
+    report: ProgressCallback,
+    started_at: datetime,
+    micro_batch: int = MICRO_BATCH_SIZE,
+) -> RefreshResult:
+    """Fetch, summarize and persist as overlapping stages joined by queues.
+
+    A fetch thread hands over stories as their bodies arrive, a summarize
+    thread runs the model on whatever is ready (up to ``micro_batch`` at a
+    time), and this thread commits each story as soon as it comes out, so
+    the model starts on the first bodies while the rest still download and
+    results show up one by one. This thread writes the stories; the
+    summarize thread only reads and stores summary cache entries, on a
+    connection it closes when done. The batch stays unfinished, and so off
+    ``/api/articles/``, until every story is in; its entries and summaries
+    are readable as they commit. If the model fails, the remaining stories
+    are stored without summaries. If a stage fails and stories are missing,
+    the batch is never finished, and if none were stored it is deleted;
+    either way the previous front page stays.
+    """
+    fingerprints = _summary_fingerprints(stories)
+    batch = ScrapeBatch.objects.create(started_at=started_at, story_count=len(stories))
+    fetched: "queue.Queue" = queue.Queue()
+    summarized: "queue.Queue" = queue.Queue()
+    errors: List[str] = []
+
+    def fetch_stage() -> None:
+        try:
+            fetching = {id(story) for story in to_fetch}
+            for story in stories:
+                if id(story) not in fetching:
+                    fetched.put(story)
+            for story in iter_article_bodies(to_fetch, cache=body_cache):
+                fetched.put(story)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Fetch stage failed")
+            errors.append(f"Fetch failed: {exc}")
+        finally:
+            fetched.put(_DONE)
+
+    def summarize_stage() -> None:
+        model_failed = False
+        try:
+            finished = False
+            while not finished:
+                # Block for one story, then take whatever else is already waiting.
+                group = [fetched.get()]
+                while len(group) < micro_batch and group[-1] is not _DONE:
+                    try:
+                        group.append(fetched.get_nowait())
+                    except queue.Empty:
+                        break
+                finished = group[-1] is _DONE
+                ready = [story for story in group if story is not _DONE]
+                needing = [story for story in ready if _needs_summary(story, fingerprints, body_cache)]
+                results: List[SummaryResult] = []
+                if needing and not model_failed:
+                    try:
+                        results = summarizer.summarize_batch([_summary_input(story) for story in needing])
+                    except Exception as exc:  # noqa: BLE001
+                        # Keep passing stories on without summaries rather
+                        # than calling a broken model for every group.
+                        logger.exception("Summarize stage failed")
+                        errors.append(f"Summarize failed: {exc}")
+                        model_failed = True
+                by_story = {id(story): result for story, result in zip(needing, results)}
+                for story in ready:
+                    summarized.put((story, by_story.get(id(story))))
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Summarize stage failed")
+            errors.append(f"Summarize failed: {exc}")
+        finally:
+            # The summary cache opened this thread's own connection.
+            connections.close_all()
+            summarized.put(_DONE)
+
+    threads = [
+        threading.Thread(target=fetch_stage, name="refresh-fetch", daemon=True),
+        threading.Thread(target=summarize_stage, name="refresh-summarize", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    fetch_urls = {story.url for story in to_fetch}
+    created = updated = summarized_count = persisted = 0
+    while True:
+        item = summarized.get()
+        if item is _DONE:
+            break
+        story, summary = item
+        if _persist_story(batch, story, summary, fetched=story.url in fetch_urls):
+            created += 1
+        else:
+            updated += 1
+        persisted += 1
+        summarized_count += summary is not None
+        report(stories_fetched=persisted, stories_summarized=summarized_count)
+    for thread in threads:
+        thread.join()
+
+    if not persisted:
+        # An empty batch would replace the front page with nothing; drop it
+        # so the previous batch stays the latest.
+        batch.delete()
+        logger.error("Streaming refresh stored no stories", extra={"errors": errors})
+        return RefreshResult(created=0, updated=0, summarized=0, errors=errors or ["Refresh stored no stories"])
+
+    complete = persisted == len(stories)
+    if complete:
+        batch.finished_at = timezone.now()
+    batch.created_count = created
+    batch.updated_count = updated
+    batch.summarized_count = summarized_count
+    batch.save(update_fields=['finished_at', 'created_count', 'updated_count', 'summarized_count'])
+    if not complete:
+        # A partial front page must not replace the previous one.
+        logger.error(
+            "Streaming refresh incomplete; batch left unfinished",
+            extra={"stored": persisted, "stories": len(stories), "errors": errors},
         )
-        summarized += 1
 
     logger.info(
-        "Refreshed top stories",
-        extra={"articles_created": created, "articles_updated": updated, "summaries_generated": summarized},
+        "Refreshed top stories (streaming)",
+        extra={
+            "bodies_fetched": len(to_fetch),
+            "articles_created": created,
+            "articles_updated": updated,
+            "summaries_generated": summarized_count,
+        },
+    )
+    return RefreshResult(
+        created=created,
+        updated=updated,
+        summarized=summarized_count,
+        errors=errors,
+        batch_id=batch.pk,
+        bodies_fetched=len(to_fetch),
     )
-    return RefreshResult(created=created, updated=updated, summarized=summarized)
+
+
+def resummarize_latest_batch(tier: str, limit: int = 30) -> int:
+    """Summarize the latest front page again with ``tier``.
+
+    Articles whose newest summary already came from ``tier`` are skipped, and
+    fallback results are not stored. Returns the number of new summaries.
+    """
+    latest = ScrapeBatch.objects.filter(finished_at__isnull=False).order_by('-finished_at').values('id')[:1]
+    articles = list(
+        Article.objects.filter(batch_entries__batch_id=Subquery(latest)).order_by('batch_entries__rank')[:limit]
+    )
+    tiers: Dict[int, str] = {}
+    for article_id, summary_tier in (
+        Summary.objects.filter(article__in=articles)
+        .order_by('article_id', '-generated_at', '-id')
+        .values_list('article_id', 'tier')
+    ):
+        tiers.setdefault(article_id, summary_tier)
+    articles = [article for article in articles if tiers.get(article.pk) != tier]
+    if not articles:
+        return 0
+
+    inputs = [article.content_text or article.title for article in articles]
+    results = get_summarizer(tier).summarize_batch(inputs)
+    summaries = [
+        Summary(
+            article=article,
+            summary_text=result.text,
+            model_name=result.model_name,
+            tier=result.tier,
+            content_fingerprint=content_fingerprint(text),
+        )
+        for article, text, result in zip(articles, inputs, results)
+        if result.tier == tier
+    ]
+    with transaction.atomic():
+        Summary.objects.bulk_create(summaries)
+        invalidate_responses_on_commit()
+    logger.info("Re-summarized latest batch", extra={"tier": tier, "summaries_generated": len(summaries)})
+    return len(summaries)
@@ -1,17 +1,64 @@
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
-from typing import List
-from urllib.parse import urljoin
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterator, List, Mapping, Optional
+from urllib.parse import urljoin, urlparse
 
-import requests
 from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .extractor import ArticleTextExtractor, incremental_decoder, is_html
+from .http_client import declared_encoding, fetch, max_response_bytes, open_stream
 
 HN_URL = "https://news.ycombinator.com/"
-USER_AGENT = "ynews-scraper/0.1 (+https://news.ycombinator.com/)"
+HN_API_URL = "https://hacker-news.firebaseio.com/v0"
+# Item records all come from one host; stay within its connection pool.
+MAX_API_WORKERS = 4
+
+# Body fetching runs in a bounded thread pool so a refresh costs roughly the
+# slowest single fetch instead of the sum of all of them.
+MAX_FETCH_WORKERS = 8
+MAX_FETCHES_PER_HOST = 2
+FETCH_TIMEOUT = 10
+BODY_FETCH_DEADLINE = 30
+# Article downloads stop once the extractor has ARTICLE_MAX_CHARS characters
+# of text (NEWS_ARTICLE_MAX_CHARS overrides it) or after the HTTP client's
+# MAX_RESPONSE_BYTES, so the rest of a large page is never read.
+ARTICLE_MAX_CHARS = 24_000
+_NON_HTML_EXTENSION = re.compile(
+    r"\.(pdf|png|jpe?g|gif|webp|svg|mp[34]|mov|webm|zip|gz|tar|dmg|exe|epub|docx?|xlsx?|pptx?)$", re.IGNORECASE
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ArticleBody:
+    """Extracted text of an article plus the validators needed to re-fetch it.
+
+    ``changed`` is False when the server answered 304 or sent bytes with the
+    same hash as the cached copy; the cached text is kept and the article is
+    not summarized again.
+    ``stale`` marks a cached copy returned because the fetch failed.
+    """
+
+    text: str = ""
+    content_hash: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    changed: bool = True
+    stale: bool = False
+    fetched_at: Optional[datetime] = None
+
+
 @dataclass
 class Story:
     hn_id: int
@@ -22,85 +69,298 @@ class Story:
     comments_count: int
     rank: int
     content_text: str = ""
+    body: Optional[ArticleBody] = None
 
 
-def _fetch_article_body(url: str, max_chars: int = 4000) -> str:
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def _fetch_article_body(
+    url: str,
+    max_chars: Optional[int] = None,
+    timeout: float = FETCH_TIMEOUT,
+    cached: Optional[ArticleBody] = None,
+) -> ArticleBody:
+    """Stream ``url`` through the extractor, stopping once ``max_chars`` of text are in.
+
+    Links to PDFs, images and other binaries are skipped without a request,
+    and non-HTML responses are dropped after their headers arrive.
+    """
+    max_chars = max_chars or getattr(settings, "NEWS_ARTICLE_MAX_CHARS", ARTICLE_MAX_CHARS)
+    if _NON_HTML_EXTENSION.search(urlparse(url).path):
+        return ArticleBody()
+
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+
     try:
-        response = requests.get(url, timeout=10, headers={"User-Agent": USER_AGENT})
-        response.raise_for_status()
+        with open_stream(url, timeout=timeout, headers=headers) as response:
+            etag = response.headers.get("ETag", "")
+            last_modified = response.headers.get("Last-Modified", "")
+            if cached and response.status_code == 304:
+                return replace(
+                    cached,
+                    etag=etag or cached.etag,
+                    last_modified=last_modified or cached.last_modified,
+                    changed=False,
+                )
+            if not is_html(response.headers.get("Content-Type", "")):
+                return ArticleBody()
+
+            # The hash covers the bytes read, which stop at the same place for
+            # the same page, so it still detects unchanged content.
+            digest = hashlib.sha256()
+            extractor = ArticleTextExtractor(max_chars)
+            decoder = None
+            size = 0
+            max_bytes = max_response_bytes()
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                if decoder is None:
+                    decoder = incremental_decoder(declared_encoding(response), chunk)
+                digest.update(chunk)
+                size += len(chunk)
+                extractor.feed(decoder.decode(chunk))
+                if extractor.done or size >= max_bytes:
+                    break
+            if decoder is not None:
+                extractor.feed(decoder.decode(b"", final=True))
+            extractor.close()
     except Exception as exc:  # noqa: BLE001
         logger.warning("Could not fetch article body", extra={"url": url, "error": str(exc)})
-        return ""
+        if cached:
+            return replace(cached, changed=False, stale=True)
+        return ArticleBody()
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    paragraphs = [p.get_text(strip=True) for p in soup.find_all("p")]
-    text = "\n".join(paragraphs)
-    return text[:max_chars]
+    content_hash = digest.hexdigest()
+    if cached and content_hash == cached.content_hash:
+        return replace(cached, etag=etag, last_modified=last_modified, changed=False)
+    return ArticleBody(extractor.text, content_hash, etag, last_modified)
 
 
-def fetch_top_stories(limit: int = 30, include_body: bool = True) -> List[Story]:
-    response = requests.get(HN_URL, timeout=10, headers={"User-Agent": USER_AGENT})
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
+def fetch_article_bodies(
+    stories: List[Story],
+    cache: Optional[Mapping[str, ArticleBody]] = None,
+    max_workers: int = MAX_FETCH_WORKERS,
+    per_host: int = MAX_FETCHES_PER_HOST,
+    deadline: float = BODY_FETCH_DEADLINE,
+) -> None:
+    """Download article bodies concurrently and store them on each story.
 
-    stories: List[Story] = []
-    for row in soup.select("tr.athing")[:limit]:
-        title_el = row.select_one("span.titleline a")
-        rank_el = row.select_one("span.rank")
-        story_id = row.get("id")
-        subtext_row = row.find_next_sibling("tr")
-        subtext = subtext_row.select_one("td.subtext") if subtext_row else None
-        author_el = subtext.select_one("a.hnuser") if subtext else None
-        score_el = subtext.select_one("span.score") if subtext else None
-        comments_el = subtext.find_all("a")[-1] if subtext else None
+    At most ``per_host`` requests hit the same host at once, and the whole
+    stage gives up after ``deadline`` seconds; stories whose body did not
+    arrive in time keep an empty ``content_text``. Bodies found in ``cache``
+    (keyed by URL) are revalidated with a conditional GET.
+    """
+    for _ in iter_article_bodies(stories, cache, max_workers, per_host, deadline):
+        pass
 
-        if not title_el or not story_id:
-            continue
 
-        url = title_el.get("href")
-        if url and url.startswith("item?id="):
-            url = urljoin(HN_URL, url)
+def iter_article_bodies(
+    stories: List[Story],
+    cache: Optional[Mapping[str, ArticleBody]] = None,
+    max_workers: int = MAX_FETCH_WORKERS,
+    per_host: int = MAX_FETCHES_PER_HOST,
+    deadline: float = BODY_FETCH_DEADLINE,
+) -> Iterator[Story]:
+    """Like :func:`fetch_article_bodies`, but yield each story with a URL as soon as its body is settled.
 
-        try:
-            rank = int(rank_el.get_text(strip=True).replace(".", "")) if rank_el else 0
-        except ValueError:
-            rank = 0
+    Stories come out in completion order; those still running at the
+    deadline come last, with their cached body if there is one.
+    """
+    cache = cache or {}
+    pending = [story for story in stories if story.url]
+    if not pending:
+        return
 
+    host_slots: Dict[str, threading.BoundedSemaphore] = {
+        _host(story.url): threading.BoundedSemaphore(per_host) for story in pending
+    }
+    started = time.monotonic()
+
+    def remaining() -> float:
+        return deadline - (time.monotonic() - started)
+
+    def fetch_one(story: Story) -> Optional[ArticleBody]:
+        slot = host_slots[_host(story.url)]
+        if not slot.acquire(timeout=max(remaining(), 0)):
+            return None
         try:
-            hn_id = int(story_id)
-        except ValueError:
-            continue
+            budget = remaining()
+            if budget <= 0:
+                return None
+            return _fetch_article_body(
+                story.url,
+                timeout=min(FETCH_TIMEOUT, budget),
+                cached=cache.get(story.url),
+            )
+        finally:
+            slot.release()
+
+    def settle(story: Story, body: Optional[ArticleBody]) -> Story:
+        # Stories that failed or ran out of time fall back to their last known body.
+        cached = cache.get(story.url)
+        if body is None and cached is not None:
+            body = replace(cached, changed=False, stale=True)
+        if body is not None:
+            story.body = body
+            story.content_text = body.text
+        return story
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hn-body")
+    futures = {executor.submit(fetch_one, story): story for story in pending}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            story = futures.pop(future)
+            try:
+                body = future.result()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Body fetch crashed", extra={"url": story.url, "error": str(exc)})
+                body = None
+            yield settle(story, body)
+    except FuturesTimeoutError:
+        logger.warning(
+            "Body fetch deadline reached",
+            extra={"deadline": deadline, "unfinished": len(futures)},
+        )
+    finally:
+        # Do not wait for stragglers; they finish on their own request timeout.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for story in futures.values():
+        yield settle(story, None)
+
+
+class StorySource:
+    """Where the front page comes from. ``STORY_SOURCES`` maps setting values to sources."""
+
+    def fetch_stories(self, limit: int = 30) -> List[Story]:
+        raise NotImplementedError
+
+
+class HtmlStorySource(StorySource):
+    """Parses the HN front page HTML."""
+
+    def __init__(self, url: str = HN_URL) -> None:
+        self.url = url
+
+    def fetch_stories(self, limit: int = 30) -> List[Story]:
+        result = fetch(self.url, timeout=FETCH_TIMEOUT)
+        soup = BeautifulSoup(result.content, "html.parser", from_encoding=result.encoding)
+
+        stories: List[Story] = []
+        for row in soup.select("tr.athing")[:limit]:
+            title_el = row.select_one("span.titleline a")
+            rank_el = row.select_one("span.rank")
+            story_id = row.get("id")
+            subtext_row = row.find_next_sibling("tr")
+            subtext = subtext_row.select_one("td.subtext") if subtext_row else None
+            author_el = subtext.select_one("a.hnuser") if subtext else None
+            score_el = subtext.select_one("span.score") if subtext else None
+            comments_el = subtext.find_all("a")[-1] if subtext else None
+
+            if not title_el or not story_id:
+                continue
+
+            url = title_el.get("href")
+            if url and url.startswith("item?id="):
+                url = urljoin(self.url, url)
+
+            try:
+                rank = int(rank_el.get_text(strip=True).replace(".", "")) if rank_el else 0
+            except ValueError:
+                rank = 0
 
-        points = 0
-        if score_el:
             try:
-                points = int(score_el.get_text(strip=True).split()[0])
+                hn_id = int(story_id)
             except ValueError:
-                points = 0
+                continue
 
-        comments_count = 0
-        if comments_el:
-            text = comments_el.get_text(strip=True)
-            if "comment" in text:
+            points = 0
+            if score_el:
                 try:
-                    comments_count = int(text.split()[0])
+                    points = int(score_el.get_text(strip=True).split()[0])
                 except ValueError:
-                    comments_count = 0
-
-        content_text = _fetch_article_body(url) if (include_body and url) else ""
-
-        stories.append(
-            Story(
-                hn_id=hn_id,
-                title=title_el.get_text(strip=True),
-                url=url or "",
-                author=author_el.get_text(strip=True) if author_el else "",
-                points=points,
-                comments_count=comments_count,
-                rank=rank,
-                content_text=content_text,
+                    points = 0
+
+            comments_count = 0
+            if comments_el:
+                text = comments_el.get_text(strip=True)
+                if "comment" in text:
+                    try:
+                        comments_count = int(text.split()[0])
+                    except ValueError:
+                        comments_count = 0
+
+            stories.append(
+                Story(
+                    hn_id=hn_id,
+                    title=title_el.get_text(strip=True),
+                    url=url or "",
+                    author=author_el.get_text(strip=True) if author_el else "",
+                    points=points,
+                    comments_count=comments_count,
+                    rank=rank,
+                )
             )
-        )
 
-    logger.info("Fetched %s stories", len(stories), extra={"limit": limit})
-    return stories
+        return stories
+
+
+class HnApiStorySource(StorySource):
+    """Reads the official HN Firebase JSON API, fetching item records concurrently."""
+
+    def __init__(self, base_url: str = HN_API_URL, max_workers: int = MAX_API_WORKERS) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+
+    def fetch_stories(self, limit: int = 30) -> List[Story]:
+        ids = json.loads(fetch(f"{self.base_url}/topstories.json", timeout=FETCH_TIMEOUT).content)[:limit]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            items = list(executor.map(self._fetch_item, ids))
+
+        stories: List[Story] = []
+        for rank, item in enumerate(items, start=1):
+            if not item or item.get("deleted") or item.get("dead") or not item.get("title"):
+                continue
+            stories.append(
+                Story(
+                    hn_id=item["id"],
+                    title=item["title"],
+                    url=item.get("url") or urljoin(HN_URL, f"item?id={item['id']}"),
+                    author=item.get("by", ""),
+                    points=item.get("score", 0),
+                    comments_count=item.get("descendants", 0),
+                    rank=rank,
+                )
+            )
+        return stories
+
+    def _fetch_item(self, item_id: int) -> Optional[dict]:
+        try:
+            return json.loads(fetch(f"{self.base_url}/item/{item_id}.json", timeout=FETCH_TIMEOUT).content)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Could not fetch HN item", extra={"item_id": item_id, "error": str(exc)})
+            return None
+
+
+STORY_SOURCES = {
+    "html": HtmlStorySource,
+    "api": HnApiStorySource,
+}
+
+
+def get_story_source(name: Optional[str] = None) -> StorySource:
+    name = name or getattr(settings, "NEWS_STORY_SOURCE", "html")
+    if name not in STORY_SOURCES:
+        raise ImproperlyConfigured(f"Unknown story source {name!r}; choose one of {', '.join(STORY_SOURCES)}")
+    return STORY_SOURCES[name]()
+
+
+def fetch_front_page(limit: int = 30, source: Optional[str] = None) -> List[Story]:
+    """Read the front page from ``source`` (default ``NEWS_STORY_SOURCE``) without article bodies."""
+    return get_story_source(source).fetch_stories(limit)
+
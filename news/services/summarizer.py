@@ -1,22 +1,138 @@
 import logging
+import re
+import threading
+import time
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from . import extractive
+from .summary_cache import SummaryCache, make_key
 
 logger = logging.getLogger(__name__)
 
+MAX_INPUT_CHARS = 3000  # Roughly 750-1000 tokens
+# Padded tokens allowed per forward pass; bigger batches only help until the
+# device runs out of memory or compute.
+BATCH_TOKEN_BUDGET = 8192
+MAX_BATCH_SIZE = 16
+# Map-reduce mode splits long inputs on sentence boundaries into chunks of at
+# most CHUNK_TOKENS tokens instead of truncating them. Only the first
+# MAX_CHUNKS chunks of an input are summarized, which caps its cost.
+CHUNK_TOKENS = 1000
+MAX_CHUNKS = 6
+
+MODEL_ID = "facebook/bart-large-cnn"
+CPU_RUNTIMES = ("pytorch", "quantized", "onnx")
+# Converted CPU models (int8, ONNX) are written here on first use.
+MODEL_CACHE_DIR = str(Path.home() / ".cache" / "ynews")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])(?=\s)")
+
 
 @dataclass
 class SummaryResult:
     text: str
     model_name: str
+    tier: str = ""
+
+
+class SummarizerBackend:
+    """Interface shared by the summarization engines in ``BACKENDS``.
+
+    ``get_summarizer`` builds the engine named by ``NEWS_SUMMARIZER_BACKEND``
+    through its ``from_settings`` constructor.
+    """
+
+    load_seconds: float = 0.0
+    tier: str = ""
+    # Measured model time per input, used to pick a tier for a latency budget.
+    seconds_per_input: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, tier: Optional[str] = None) -> "SummarizerBackend":
+        return cls()
+
+    @property
+    def model_name(self) -> str:
+        raise NotImplementedError
+
+    def summarize(self, text: str, max_words: int = 120) -> SummaryResult:
+        return self.summarize_batch([text], max_words=max_words)[0]
+
+    def summarize_batch(self, texts: List[str], max_words: int = 120) -> List[SummaryResult]:
+        raise NotImplementedError
+
+
+class ExtractiveSummarizer(SummarizerBackend):
+    """TextRank sentence extraction; needs no model and runs in milliseconds on a CPU."""
+
+    @property
+    def model_name(self) -> str:
+        return "textrank-extractive"
+
+    def summarize_batch(self, texts: List[str], max_words: int = 120) -> List[SummaryResult]:
+        return [
+            SummaryResult(text=extractive.summarize(text, max_words) or "No content available.", model_name=self.model_name)
+            for text in texts
+        ]
 
 
-class LocalSummarizer:
+class LocalSummarizer(SummarizerBackend):
     """Lightweight wrapper that prefers local GPU (MPS) when available."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        batch_token_budget: int = BATCH_TOKEN_BUDGET,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        cache: Optional[SummaryCache] = None,
+        map_reduce: bool = False,
+        chunk_tokens: int = CHUNK_TOKENS,
+        max_chunks: int = MAX_CHUNKS,
+        model_id: str = MODEL_ID,
+        tier: str = "",
+        device: Optional[str] = None,
+        cpu_runtime: str = "pytorch",
+        model_cache_dir: str = MODEL_CACHE_DIR,
+    ) -> None:
+        self._batch_token_budget = batch_token_budget
+        self._max_batch_size = max_batch_size
+        self._cache = cache
+        self._map_reduce = map_reduce
+        self._chunk_tokens = chunk_tokens
+        self._max_chunks = max_chunks
+        if cpu_runtime not in CPU_RUNTIMES:
+            raise ImproperlyConfigured(f"Unknown CPU_RUNTIME {cpu_runtime!r}; choose one of {', '.join(CPU_RUNTIMES)}")
+        self._model_id = model_id
+        self.tier = tier
+        self._device = device
+        self._cpu_runtime = cpu_runtime
+        self._model_cache_dir = model_cache_dir
         self._pipeline = None
         self._model_name = "local-gpu"
+        # Serializes model calls when one instance is shared across threads.
+        self._lock = threading.Lock()
+        started = time.perf_counter()
         self._setup_pipeline()
+        self.load_seconds = time.perf_counter() - started
+
+    @classmethod
+    def from_settings(cls, tier: Optional[str] = None) -> "LocalSummarizer":
+        tier = tier or default_tier()
+        options = getattr(settings, "NEWS_SUMMARIZER", {})
+        return cls(
+            cache=SummaryCache.from_settings(),
+            model_id=tier_settings(tier)["MODEL"],
+            tier=tier,
+            **{key.lower(): value for key, value in options.items()},
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
 
     def _setup_pipeline(self) -> None:
         try:
@@ -25,7 +141,10 @@ class LocalSummarizer:
             from transformers import pipeline  # type: ignore
             
             # Check device availability
-            if torch.backends.mps.is_available():
+            if self._device is not None:
+                device = self._device
+                logger.info(f"Using configured device {device} for summarization")
+            elif torch.backends.mps.is_available():
                 device = "mps"
                 logger.info("Using Apple MPS (Metal Performance Shaders) for summarization")
             elif torch.cuda.is_available():
@@ -34,16 +153,39 @@ class LocalSummarizer:
             else:
                 device = -1  # CPU
                 logger.info("Using CPU for summarization")
-            
-            # Initialize pipeline with a more efficient model
-            self._pipeline = pipeline(
-                "summarization",
-                model="facebook/bart-large-cnn",
-                device=device,
-                dtype=torch.float16 if device != -1 else torch.float32,  # Use half precision on GPU
-            )
-            self._model_name = f"bart-large-cnn ({device if isinstance(device, str) else 'cuda' if device >= 0 else 'cpu'})"
-            logger.info("Successfully initialized transformers summarizer", extra={"device": device})
+            on_cpu = device in (-1, "cpu")
+
+            runtime = self._cpu_runtime if on_cpu else "pytorch"
+            model = None
+            if runtime != "pytorch":
+                try:
+                    model = self._load_cpu_model(runtime)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning(
+                        "Could not load the CPU runtime; using PyTorch", extra={"runtime": runtime, "error": str(exc)}
+                    )
+            if model is None:
+                runtime = "pytorch"
+                # Initialize pipeline with a more efficient model
+                self._pipeline = pipeline(
+                    "summarization",
+                    model=self._model_id,
+                    device=device,
+                    dtype=torch.float32 if on_cpu else torch.float16,  # Use half precision on GPU
+                )
+            else:
+                # ONNX Runtime models manage their own execution provider.
+                self._pipeline = pipeline(
+                    "summarization",
+                    model=model,
+                    tokenizer=self._model_id,
+                    device=device if runtime == "quantized" else None,
+                )
+            label = "cpu" if on_cpu else device if isinstance(device, str) else "cuda"
+            if runtime != "pytorch":
+                label = f"{label}, {runtime}"
+            self._model_name = f"{Path(self._model_id).name} ({label})"
+            logger.info("Successfully initialized transformers summarizer", extra={"device": device, "runtime": runtime})
         except ImportError:
             logger.warning("torch/transformers not installed; using fallback summarizer")
             self._pipeline = None
@@ -51,59 +193,305 @@ class LocalSummarizer:
             logger.warning("Failed to init transformers summarizer; falling back", extra={"error": str(exc)})
             self._pipeline = None
 
-    def summarize(self, text: str, max_words: int = 120) -> SummaryResult:
-        if not text.strip():
-            return SummaryResult(text="No content available.", model_name=self._model_name)
+    def _load_cpu_model(self, runtime: str):
+        """Load a CPU-optimized copy of the model, converting and caching it on first use.
+
+        ``quantized`` applies dynamic int8 quantization to the linear layers
+        and pickles the result, under a name that includes the torch and
+        transformers versions; ``onnx`` exports the model to ONNX Runtime
+        through optimum. Returns None, so the caller uses plain PyTorch, if the
+        runtime is unavailable or a cached copy cannot be loaded.
+        """
+        cache_dir = Path(self._model_cache_dir) / re.sub(r"[^\w.-]+", "--", self._model_id.strip("/"))
+        if runtime == "quantized":
+            import torch  # type: ignore
+            import transformers  # type: ignore
+            from transformers import AutoModelForSeq2SeqLM  # type: ignore
 
-        if self._pipeline:
+            # A pickled module only loads into the library versions that wrote it.
+            path = cache_dir / f"int8-torch{torch.__version__}-transformers{transformers.__version__}.pt"
+            if path.exists():
+                try:
+                    # The file is our own pickled module, written below.
+                    return torch.load(path, weights_only=False)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Discarding unreadable int8 model", extra={"path": str(path), "error": str(exc)})
+                    path.unlink(missing_ok=True)
+                    return None
+            model = AutoModelForSeq2SeqLM.from_pretrained(self._model_id)
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            torch.save(model, path)
+            logger.info("Cached int8 model", extra={"path": str(path)})
+            return model
+
+        if runtime == "onnx":
             try:
+                from optimum.onnxruntime import ORTModelForSeq2SeqLM  # type: ignore
+            except ImportError:
+                logger.warning("optimum[onnxruntime] not installed; using PyTorch on the CPU")
+                return None
+            path = cache_dir / "onnx"
+            if path.exists():
+                return ORTModelForSeq2SeqLM.from_pretrained(path)
+            model = ORTModelForSeq2SeqLM.from_pretrained(self._model_id, export=True)
+            model.save_pretrained(path)
+            logger.info("Cached ONNX model", extra={"path": str(path)})
+            return model
+
+        return None
+
+    def summarize_batch(self, texts: List[str], max_words: int = 120) -> List[SummaryResult]:
+        """Summarize many texts, running the model on length-bucketed batches.
+
+        Inputs already in the summary cache, and repeats within ``texts``,
+        never reach the model. The rest are tokenized once and sorted by
+        token count so each batch pads to similar lengths, and a batch grows
+        only while ``batch_size * longest_input`` stays under the token budget.
+        """
+        results: List[Optional[SummaryResult]] = [None] * len(texts)
+        # Calculate token lengths more conservatively
+        max_length = min(142, max_words + 20)  # Add buffer for model output
+        min_length = min(30, max_length // 4)
+        params: Dict[str, object] = {"max_length": max_length, "min_length": min_length}
+        if self._map_reduce:
+            params.update(chunk_tokens=self._chunk_tokens, max_chunks=self._max_chunks)
+        else:
+            params["max_input_chars"] = MAX_INPUT_CHARS
+
+        # Positions in ``texts`` waiting on each distinct input.
+        waiting: Dict[str, List[int]] = {}
+        inputs: Dict[str, str] = {}
+        for index, text in enumerate(texts):
+            if not text.strip():
+                results[index] = SummaryResult(
+                    text="No content available.", model_name=self._model_name, tier=self.tier
+                )
+                continue
+            if not self._map_reduce:
                 # Truncate input to prevent token limit issues
-                max_input_chars = 3000  # Roughly 750-1000 tokens
-                input_text = text[:max_input_chars] if len(text) > max_input_chars else text
-                
-                # Calculate token lengths more conservatively
-                max_length = min(142, max_words + 20)  # Add buffer for model output
-                min_length = min(30, max_length // 4)
-                
-                output = self._pipeline(
-                    input_text,
-                    max_length=max_length,
-                    min_length=min_length,
-                    do_sample=False,
-                    truncation=True,
-                )[0]["summary_text"]
-                
-                logger.info(f"Generated summary with {self._model_name}")
-                return SummaryResult(text=output.strip(), model_name=self._model_name)
+                text = text[:MAX_INPUT_CHARS]
+            key = make_key(text, self._model_name, params)
+            waiting.setdefault(key, []).append(index)
+            inputs[key] = text
+
+        if self._pipeline and waiting:
+            cached = self._cache.get_many(waiting) if self._cache is not None else {}
+            if cached:
+                logger.info(f"Reused {len(cached)} cached summaries")
+            pending = {key: inputs[key] for key in waiting if key not in cached}
+            started = time.perf_counter()
+            if self._map_reduce:
+                generated = self._summarize_chunked(pending, max_length, min_length)
+            else:
+                generated = self._generate_texts(pending, max_length, min_length)
+            if generated:
+                self._record_speed((time.perf_counter() - started) / len(pending))
+            if self._cache is not None:
+                self._cache.set_many(generated, self._model_name)
+
+            for key, summary_text in {**cached, **generated}.items():
+                for index in waiting[key]:
+                    results[index] = SummaryResult(text=summary_text, model_name=self._model_name, tier=self.tier)
+
+        for index, text in enumerate(texts):
+            if results[index] is None:
+                results[index] = self._fallback(text, max_words)
+        return results
+
+    def _record_speed(self, seconds: float) -> None:
+        # Moving average, so one slow batch does not flip tier selection.
+        previous = self.seconds_per_input
+        self.seconds_per_input = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+
+    def _summarize_chunked(self, texts: Dict[str, str], max_length: int, min_length: int) -> Dict[str, str]:
+        """Map-reduce: summarize every chunk, then summarize the joined chunk summaries.
+
+        Inputs that fit in one chunk are summarized directly. Any input with a
+        failed chunk is left out, so the caller falls back for it.
+        """
+        keys = list(texts)
+        documents = self._split_into_chunks([texts[key] for key in keys])
+        partials = self._generate(
+            {(key, number): ids for key, chunks in zip(keys, documents) for number, ids in enumerate(chunks)},
+            max_length,
+            min_length,
+        )
+
+        summaries: Dict[str, str] = {}
+        combined: Dict[str, str] = {}
+        for key, chunks in zip(keys, documents):
+            parts = [partials.get((key, number)) for number in range(len(chunks))]
+            if not parts or None in parts:
+                continue
+            if len(parts) == 1:
+                summaries[key] = parts[0]
+            else:
+                combined[key] = " ".join(parts)
+        if combined:
+            summaries.update(self._generate_texts(combined, max_length, min_length))
+        return summaries
+
+    def _split_into_chunks(self, texts: List[str]) -> List[List[List[int]]]:
+        """Token ids for each chunk of each text, from one tokenizer call.
+
+        Sentences are packed greedily into chunks of at most ``chunk_tokens``
+        ids including special tokens; a longer sentence is cut. The ids are
+        fed to the model as they are, so chunks are never re-tokenized.
+        """
+        tokenizer = self._pipeline.tokenizer
+        sentences = [_SENTENCE_END.split(text) for text in texts]
+        encoded = iter(tokenizer([s for doc in sentences for s in doc], add_special_tokens=False)["input_ids"])
+        room = self._chunk_tokens - len(tokenizer.build_inputs_with_special_tokens([]))
+
+        documents = []
+        for doc in sentences:
+            chunks: List[List[int]] = [[]]
+            for _ in doc:
+                ids = next(encoded)
+                for start in range(0, len(ids), room):
+                    piece = ids[start:start + room]
+                    if len(chunks[-1]) + len(piece) > room:
+                        chunks.append([])
+                    chunks[-1].extend(piece)
+            chunks = [chunk for chunk in chunks if chunk]
+            if len(chunks) > self._max_chunks:
+                logger.info(f"Summarizing the first {self._max_chunks} of {len(chunks)} chunks")
+                chunks = chunks[:self._max_chunks]
+            documents.append([tokenizer.build_inputs_with_special_tokens(chunk) for chunk in chunks])
+        return documents
+
+    def _generate(self, inputs: Dict[Hashable, List[int]], max_length: int, min_length: int) -> Dict[Hashable, str]:
+        """Run the model over token ids; inputs of a failed batch are left out."""
+        outputs: Dict[Hashable, str] = {}
+        tokenizer = self._pipeline.tokenizer
+        model = self._pipeline.model
+        for batch in self._make_batches(list(inputs.items())):
+            try:
+                encoded = tokenizer.pad({"input_ids": [ids for _, ids in batch]}, return_tensors="pt").to(model.device)
+                with self._lock:
+                    output_ids = model.generate(**encoded, max_length=max_length, min_length=min_length, do_sample=False)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Summarization failed; using fallback", extra={"error": str(exc)})
-                # Fall through to fallback
+                continue
+            decoded = tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+            for (key, _), text in zip(batch, decoded):
+                outputs[key] = text.strip()
+            logger.info(f"Generated {len(batch)} summaries with {self._model_name}")
+        return outputs
 
-        # Fallback: Extract key sentences or truncate intelligently
-        if not text.strip():
-            return SummaryResult(text="No content available.", model_name=f"{self._model_name}-fallback")
-            
-        # Try to extract first few sentences up to word limit
-        sentences = [s.strip() for s in text.replace('\n', ' ').split('.') if s.strip()]
-        summary_parts = []
-        word_count = 0
-        
-        for sentence in sentences:
-            sentence_words = len(sentence.split())
-            if word_count + sentence_words <= max_words:
-                summary_parts.append(sentence)
-                word_count += sentence_words
-            else:
-                break
-        
-        if summary_parts:
-            fallback_text = '. '.join(summary_parts) + '.'
-        else:
-            # Last resort: truncate by words
-            words = text.split()
-            fallback_text = ' '.join(words[:max_words]) + ('...' if len(words) > max_words else '')
-        
+    def _generate_texts(self, texts: Dict[str, str], max_length: int, min_length: int) -> Dict[str, str]:
+        if not texts:
+            return {}
+        encoded = self._pipeline.tokenizer(list(texts.values()), truncation=True, add_special_tokens=True)
+        return self._generate(dict(zip(texts, encoded["input_ids"])), max_length, min_length)
+
+    def _make_batches(self, items: List[Tuple[Hashable, List[int]]]) -> List[List[Tuple[Hashable, List[int]]]]:
+        ordered = sorted(items, key=lambda item: len(item[1]), reverse=True)
+
+        batches: List[List[Tuple[Hashable, List[int]]]] = []
+        current: List[Tuple[Hashable, List[int]]] = []
+        longest = 0
+        for item in ordered:
+            full = len(current) >= self._max_batch_size or (len(current) + 1) * longest > self._batch_token_budget
+            if current and full:
+                batches.append(current)
+                current = []
+            if not current:
+                # Sorted longest first, so the first item sets the padded width.
+                longest = len(item[1])
+            current.append(item)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _fallback(self, text: str, max_words: int) -> SummaryResult:
         return SummaryResult(
-            text=fallback_text or "No content available.", 
-            model_name=f"{self._model_name}-fallback"
+            text=extractive.summarize(text, max_words) or "No content available.",
+            model_name=f"{self._model_name}-fallback",
         )
+
+
+BACKENDS = {
+    "transformers": LocalSummarizer,
+    "extractive": ExtractiveSummarizer,
+}
+
+_shared_summarizers: Dict[str, SummarizerBackend] = {}
+_shared_lock = threading.Lock()
+
+WARM_UP_TEXT = (
+    "The summarizer loads its model once per process. "
+    "This short passage runs it end to end so the first real refresh does not pay for lazy initialization."
+)
+
+
+def tier_settings(tier: str) -> Dict[str, object]:
+    tiers = getattr(settings, "NEWS_SUMMARIZER_TIERS", {})
+    if tier not in tiers:
+        raise ImproperlyConfigured(f"Unknown summarizer tier {tier!r}; choose one of {', '.join(tiers)}")
+    return tiers[tier]
+
+
+def default_tier() -> str:
+    return getattr(settings, "NEWS_SUMMARIZER_DEFAULT_TIER", "quality")
+
+
+def select_tier(count: int, latency_budget: Optional[float] = None) -> str:
+    """Pick the best tier expected to summarize ``count`` inputs within ``latency_budget`` seconds.
+
+    ``NEWS_SUMMARIZER_TIERS`` lists tiers fastest first. A loaded tier's
+    measured speed replaces its configured ``SECONDS_PER_STORY`` estimate.
+    With no budget the default tier is used; if nothing fits, the fastest.
+    """
+    if latency_budget is None:
+        return default_tier()
+    tiers = list(getattr(settings, "NEWS_SUMMARIZER_TIERS", {}))
+    for tier in reversed(tiers):
+        loaded = _shared_summarizers.get(tier)
+        per_input = loaded.seconds_per_input if loaded and loaded.seconds_per_input is not None else None
+        if per_input is None:
+            per_input = tier_settings(tier).get("SECONDS_PER_STORY", 0)
+        if per_input * count <= latency_budget:
+            return tier
+    return tiers[0] if tiers else default_tier()
+
+
+def get_summarizer(tier: Optional[str] = None) -> SummarizerBackend:
+    """Return the process-wide summarizer for ``tier``, loading the model on first use."""
+    name = getattr(settings, "NEWS_SUMMARIZER_BACKEND", "transformers")
+    if name not in BACKENDS:
+        raise ImproperlyConfigured(f"Unknown NEWS_SUMMARIZER_BACKEND {name!r}; choose one of {', '.join(BACKENDS)}")
+    # Tiers only choose between transformers models.
+    key = (tier or default_tier()) if name == "transformers" else name
+    summarizer = _shared_summarizers.get(key)
+    if summarizer is None:
+        with _shared_lock:
+            summarizer = _shared_summarizers.get(key)
+            if summarizer is None:
+                summarizer = BACKENDS[name].from_settings(tier)
+                logger.info(
+                    "Loaded summarizer %s in %.2fs",
+                    summarizer.model_name,
+                    summarizer.load_seconds,
+                    extra={"load_seconds": summarizer.load_seconds},
+                )
+                _shared_summarizers[key] = summarizer
+    return summarizer
+
+
+def warm_up() -> float:
+    """Load the shared summarizer and run one dummy input through it.
+
+    Returns the total seconds spent, including the model load.
+    """
+    started = time.perf_counter()
+    get_summarizer().summarize(WARM_UP_TEXT)
+    elapsed = time.perf_counter() - started
+    logger.info("Summarizer warm-up finished in %.2fs", elapsed)
+    return elapsed
+
+
+def reset_summarizer() -> None:
+    with _shared_lock:
+        _shared_summarizers.clear()
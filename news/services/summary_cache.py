@@ -0,0 +1,104 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from ..models import SummaryCacheEntry
+
+logger = logging.getLogger(__name__)
+
+MAX_MEMORY_ENTRIES = 1024
+
+
+def content_fingerprint(text: str) -> str:
+    """Hash of ``text`` with whitespace normalized."""
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+def make_key(text: str, model_name: str, params: Mapping[str, object]) -> str:
+    """Cache key for summarizing ``text`` with ``model_name`` and generation ``params``."""
+    raw = json.dumps([content_fingerprint(text), model_name, dict(params)], sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class SummaryCache:
+    """Two-tier cache of generated summaries: an in-process LRU over a table.
+
+    Lookups try memory first and fall back to ``SummaryCacheEntry`` rows, which
+    survive restarts and are shared between processes. Database errors are
+    logged and treated as misses so the cache can never fail a refresh.
+    """
+
+    def __init__(self, max_entries: int = MAX_MEMORY_ENTRIES, persist: bool = True) -> None:
+        self._max_entries = max_entries
+        self._persist = persist
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "SummaryCache":
+        overrides = getattr(settings, "NEWS_SUMMARY_CACHE", {})
+        return cls(**{key.lower(): value for key, value in overrides.items()})
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Return cached summary texts for whichever ``keys`` are known."""
+        found: Dict[str, str] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+
+        if missing and self._persist:
+            try:
+                stored = dict(
+                    SummaryCacheEntry.objects.filter(key__in=missing).values_list("key", "summary_text")
+                )
+            except DatabaseError as exc:
+                logger.warning("Summary cache lookup failed", extra={"error": str(exc)})
+                stored = {}
+            self._remember(stored)
+            found.update(stored)
+        return found
+
+    def set_many(self, entries: Mapping[str, str], model_name: str) -> None:
+        """Store summary texts produced by ``model_name`` under their keys."""
+        if not entries:
+            return
+        self._remember(entries)
+        if not self._persist:
+            return
+
+        try:
+            SummaryCacheEntry.objects.bulk_create(
+                [
+                    SummaryCacheEntry(key=key, model_name=model_name, summary_text=text)
+                    for key, text in entries.items()
+                ],
+                ignore_conflicts=True,
+            )
+        except DatabaseError as exc:
+            logger.warning("Summary cache write failed", extra={"error": str(exc)})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, entries: Mapping[str, str]) -> None:
+        with self._lock:
+            for key, text in entries.items():
+                self._memory[key] = text
+                self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_responses_on_commit
+from .models import Article, BatchEntry, ScrapeBatch, Summary
+
+
+@receiver([post_save, post_delete], sender=Article)
+@receiver([post_save, post_delete], sender=Summary)
+@receiver([post_save, post_delete], sender=ScrapeBatch)
+@receiver([post_save, post_delete], sender=BatchEntry)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate_responses_on_commit()
@@ -1,11 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import replace
 from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
 
-from django.test import TestCase
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
 
-from .models import Article, Summary
+from backend.database import database_settings
+
+from .models import Article, ArticleBodyCache, BatchEntry, RefreshJob, ScrapeBatch, Summary, SummaryCacheEntry
+from .services import events, extractive, http_client, jobs, pipeline, scraper
+from .services.extractor import ArticleTextExtractor
+from .services.scraper import ArticleBody, Story
+from .services import summarizer as summarizer_module
+from .services.summarizer import LocalSummarizer, SummaryResult
+from .services.summary_cache import SummaryCache
 
 
 class ArticleModelTest(TestCase):
@@ -270,8 +295,8 @@ class ArticleSerializerTest(APITestCase):
         self.old_summary.refresh_from_db()
         self.new_summary.refresh_from_db()
 
-    def test_latest_summary_returns_earliest(self):
-        """Test that latest_summary returns the earliest (oldest) summary."""
+    def test_latest_summary_returns_newest(self):
+        """Test that latest_summary returns the newest summary."""
         # Refresh to get the actual ID from database
         self.article.refresh_from_db()
         
@@ -300,9 +325,1565 @@ class ArticleSerializerTest(APITestCase):
         
         self.assertEqual(response.status_code, 200)
         
-        # The "latest" summary should be the oldest one (earliest generated_at)
+        # The latest summary is the one with the newest generated_at
         latest_summary = response.data['latest_summary']
         self.assertIsNotNone(latest_summary)
-        self.assertEqual(latest_summary['model_name'], 'old-model')
-        self.assertEqual(latest_summary['summary_text'], 'Old summary')
+        self.assertEqual(latest_summary['model_name'], 'new-model')
+        self.assertEqual(latest_summary['summary_text'], 'New summary')
+
+        # The list serves the same summary from its prefetch
+        self.assertEqual(test_article['latest_summary']['model_name'], 'new-model')
+
+
+
+class FetchArticleBodiesTest(SimpleTestCase):
+    def _stories(self, urls):
+        return [
+            Story(hn_id=i, title=f"Story {i}", url=url, author="", points=0, comments_count=0, rank=i)
+            for i, url in enumerate(urls, start=1)
+        ]
+
+    def test_bodies_are_fetched_concurrently_with_per_host_limit(self):
+        """Bodies download in parallel, but never more than per_host at once for one host."""
+        lock = threading.Lock()
+        active = {}
+        peak = {}
+
+        def fake_fetch(url, timeout, cached):
+            host = scraper._host(url)
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.05)
+            with lock:
+                active[host] -= 1
+            return ArticleBody(text=f"body of {url}")
+
+        urls = [f"https://a.example/{i}" for i in range(4)] + [f"https://b.example/{i}" for i in range(4)]
+        stories = self._stories(urls)
+        with mock.patch.object(scraper, "_fetch_article_body", side_effect=fake_fetch):
+            started = time.monotonic()
+            scraper.fetch_article_bodies(stories, max_workers=8, per_host=2, deadline=5)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual([s.content_text for s in stories], [f"body of {url}" for url in urls])
+        self.assertEqual(peak, {"a.example": 2, "b.example": 2})
+        self.assertLess(elapsed, 8 * 0.05)
+
+    def test_deadline_leaves_slow_bodies_empty(self):
+        """Stories that miss the overall deadline keep an empty body."""
+
+        def fake_fetch(url, timeout, cached):
+            if "slow" in url:
+                time.sleep(0.5)
+            return ArticleBody(text="ok")
+
+        stories = self._stories(["https://fast.example/", "https://slow.example/"])
+        with mock.patch.object(scraper, "_fetch_article_body", side_effect=fake_fetch):
+            scraper.fetch_article_bodies(stories, deadline=0.1)
+
+        self.assertEqual(stories[0].content_text, "ok")
+        self.assertEqual(stories[1].content_text, "")
+
+    def test_deadline_falls_back_to_cached_body(self):
+        def fake_fetch(url, timeout, cached):
+            time.sleep(0.5)
+            return ArticleBody(text="fresh")
+
+        stories = self._stories(["https://slow.example/"])
+        cache = {"https://slow.example/": ArticleBody(text="cached", content_hash="abc", changed=False)}
+        with mock.patch.object(scraper, "_fetch_article_body", side_effect=fake_fetch):
+            scraper.fetch_article_bodies(stories, cache=cache, deadline=0.1)
+
+        self.assertEqual(stories[0].content_text, "cached")
+        self.assertFalse(stories[0].body.changed)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Minimal HTTP server standing in for remote sites in tests."""
+
+    flaky_hits = 0
+    paths = []
+    bytes_sent = 0
+    ARTICLE = (
+        b"<html><head><style>p { color: red }</style></head><body>"
+        b"<nav><p>Home</p><p>About</p></nav><header><p>Subscribe now</p></header>"
+        b"<p>First <b>paragraph</b>.</p><script>var p = '<p>';</script>"
+        b"<p>Second,\n split over lines.</p><aside><p>Related</p></aside>"
+        + b"<p>" + b"filler " * 20_000 + b"</p><footer><p>Copyright</p></footer></body></html>"
+    )
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        if self.path in ("/article", "/binary"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html" if self.path == "/article" else "application/octet-stream")
+            self.send_header("Content-Length", str(len(self.ARTICLE)))
+            self.end_headers()
+            type(self).bytes_sent = 0
+            try:
+                for start in range(0, len(self.ARTICLE), 4096):
+                    self.wfile.write(self.ARTICLE[start:start + 4096])
+                    self.wfile.flush()
+                    type(self).bytes_sent += 4096
+                    time.sleep(0.001)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            body = b"<p>versioned</p>"
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path == "/big":
+            body = b"<p>" + b"x" * 200_000 + b"</p>"
+        elif self.path == "/flaky":
+            type(self).flaky_hits += 1
+            if type(self).flaky_hits == 1:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = b"<p>recovered</p>"
+        else:
+            body = b"<p>hello</p>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Serves responses recorded from news.ycombinator.com and the HN API."""
+
+    root = Path(__file__).resolve().parent / "testdata" / "hn"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        path = (self.root / self.path.lstrip("/")).resolve()
+        if self.root not in path.parents or not path.is_file():
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.active -= 1
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json" if path.suffix == ".json" else "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StorySourceTest(SimpleTestCase):
+    EXPECTED = [
+        (41001, "A new borrow checker for Rust", "https://example.org/rust-borrow-checker", "ferris", 312, 128, 1),
+        (41002, "Ask HN: How do you back up your home server?", "https://news.ycombinator.com/item?id=41002", "tapes", 45, 0, 2),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        http_client.reset_session()
+        super().tearDownClass()
+
+    @staticmethod
+    def _fields(stories):
+        return [(s.hn_id, s.title, s.url, s.author, s.points, s.comments_count, s.rank) for s in stories]
+
+    def test_html_source(self):
+        stories = scraper.HtmlStorySource(url=f"{self.base}/front_page.html").fetch_stories(limit=3)
+        fields = self._fields(stories)
+        self.assertEqual(fields[0], self.EXPECTED[0])
+        # Ask HN links are resolved against the page they were scraped from.
+        self.assertEqual(fields[1][2], f"{self.base}/item?id=41002")
+        self.assertEqual(fields[2][0], 41003)
+
+    def test_api_source_fetches_items_concurrently(self):
+        _FixtureHandler.peak = 0
+        stories = scraper.HnApiStorySource(base_url=f"{self.base}/v0", max_workers=4).fetch_stories(limit=4)
+        # The deleted item is dropped but ranks keep their front-page position.
+        self.assertEqual(self._fields(stories)[:2], self.EXPECTED)
+        self.assertEqual([(s.hn_id, s.rank) for s in stories[2:]], [(41003, 4)])
+        self.assertGreater(_FixtureHandler.peak, 1)
+
+    def test_source_is_selected_by_name(self):
+        self.assertIsInstance(scraper.get_story_source("api"), scraper.HnApiStorySource)
+        with self.settings(NEWS_STORY_SOURCE="html"):
+            self.assertIsInstance(scraper.get_story_source(), scraper.HtmlStorySource)
+        with self.assertRaises(ImproperlyConfigured):
+            scraper.get_story_source("rss")
+
+
+class HttpClientTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        http_client.reset_session()
+        super().tearDownClass()
+
+    def test_session_is_shared(self):
+        self.assertIs(http_client.get_session(), http_client.get_session())
+
+    def test_oversized_response_is_truncated_or_rejected(self):
+        """Downloads stop at the byte cap instead of reading the whole page."""
+        result = http_client.fetch(f"{self.base}/big", timeout=5, max_bytes=1000, allow_truncation=True)
+        self.assertTrue(result.truncated)
+        self.assertEqual(len(result.content), 1000)
+
+        with self.assertRaises(http_client.ResponseTooLarge):
+            http_client.fetch(f"{self.base}/big", timeout=5, max_bytes=1000)
+
+    def test_configured_cap_applies_to_the_first_fetch(self):
+        http_client.reset_session()
+        self.addCleanup(http_client.reset_session)
+        with self.settings(NEWS_HTTP_CLIENT={"MAX_RESPONSE_BYTES": 1000}):
+            result = http_client.fetch(f"{self.base}/big", timeout=5, allow_truncation=True)
+        self.assertTrue(result.truncated)
+        self.assertEqual(len(result.content), 1000)
+
+    def test_transient_errors_are_retried(self):
+        _StandInHandler.flaky_hits = 0
+        result = http_client.fetch(f"{self.base}/flaky", timeout=5)
+        self.assertEqual(result.text, "<p>recovered</p>")
+        self.assertEqual(_StandInHandler.flaky_hits, 2)
+
+    def test_article_body_uses_client(self):
+        self.assertEqual(scraper._fetch_article_body(f"{self.base}/page").text, "hello")
+
+    def test_conditional_get_reuses_cached_body(self):
+        """A 304 answer keeps the cached text without downloading or parsing."""
+        first = scraper._fetch_article_body(f"{self.base}/etag")
+        self.assertTrue(first.changed)
+        self.assertEqual(first.etag, '"v1"')
+
+        cached = ArticleBody(text="cached text", content_hash=first.content_hash, etag=first.etag)
+        second = scraper._fetch_article_body(f"{self.base}/etag", cached=cached)
+        self.assertFalse(second.changed)
+        self.assertEqual(second.text, "cached text")
+
+    def test_article_body_stops_at_configured_byte_cap(self):
+        http_client.reset_session()
+        self.addCleanup(http_client.reset_session)
+        with self.settings(NEWS_HTTP_CLIENT={"MAX_RESPONSE_BYTES": 1000}):
+            body = scraper._fetch_article_body(f"{self.base}/big", max_chars=1_000_000)
+        self.assertTrue(body.text.startswith("xxx"))
+        self.assertLess(len(body.text), 20_000)
+
+    def test_unchanged_hash_keeps_cached_body(self):
+        first = scraper._fetch_article_body(f"{self.base}/page")
+        cached = ArticleBody(text="cached text", content_hash=first.content_hash)
+        second = scraper._fetch_article_body(f"{self.base}/page", cached=cached)
+        self.assertFalse(second.changed)
+        self.assertEqual(second.text, "cached text")
+
+    def test_extraction_stops_early_and_skips_boilerplate(self):
+        body = scraper._fetch_article_body(f"{self.base}/article", max_chars=30)
+        self.assertEqual(body.text, "First paragraph.\nSecond, split")
+        self.assertLess(_StandInHandler.bytes_sent, len(_StandInHandler.ARTICLE))
+
+    def test_form_wrapped_article_is_extracted(self):
+        """ASP.NET-style pages wrap the whole body in one <form>."""
+        extractor = ArticleTextExtractor(max_chars=1000)
+        extractor.feed('<form id="aspnetForm"><div><p>Main article text.</p><button>Go</button></div></form>')
+        extractor.close()
+        self.assertEqual(extractor.text, "Main article text.")
+
+    def test_non_html_is_not_downloaded(self):
+        _StandInHandler.paths = []
+        self.assertEqual(scraper._fetch_article_body(f"{self.base}/paper.pdf"), ArticleBody())
+        self.assertEqual(_StandInHandler.paths, [])
+        self.assertEqual(scraper._fetch_article_body(f"{self.base}/binary"), ArticleBody())
+        self.assertLess(_StandInHandler.bytes_sent, len(_StandInHandler.ARTICLE))
+
+
+class RefreshBodyCacheTest(TestCase):
+    """The refresh pipeline persists bodies and only re-summarizes changed content."""
+
+    def setUp(self):
+        self.summarizer = mock.Mock()
+        self.summarizer.summarize_batch.side_effect = lambda texts: [
+            SummaryResult(text=f"summary: {text}", model_name="test") for text in texts
+        ]
+        patcher = mock.patch.object(pipeline, "get_summarizer", return_value=self.summarizer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _refresh(self, body, incremental=True):
+        def fake_fetch_bodies(stories, cache):
+            for story in stories:
+                cached = cache.get(story.url)
+                changed = not cached or cached.content_hash != body.content_hash
+                story.body = ArticleBody(body.text, body.content_hash, changed=changed)
+                story.content_text = body.text
+
+        story = Story(hn_id=1, title="Story", url="https://example.com/a", author="", points=1, comments_count=0, rank=1)
+        with mock.patch.object(pipeline, "fetch_front_page", return_value=[story]), \
+                mock.patch.object(pipeline, "fetch_article_bodies", side_effect=fake_fetch_bodies):
+            return pipeline.refresh_top_articles_and_summaries(limit=1, incremental=incremental)
+
+    def test_unchanged_content_is_not_resummarized(self):
+        self.assertEqual(self._refresh(ArticleBody("v1 text", "hash-1")).summarized, 1)
+        self.assertEqual(self._refresh(ArticleBody("v1 text", "hash-1")).summarized, 0)
+        self.assertEqual(ArticleBodyCache.objects.get().content_hash, "hash-1")
+
+    def test_changed_content_is_resummarized(self):
+        self._refresh(ArticleBody("v1 text", "hash-1"))
+        self.assertEqual(self._refresh(ArticleBody("v2 text", "hash-2"), incremental=False).summarized, 1)
+        self.assertEqual(Summary.objects.count(), 2)
+        self.assertEqual(ArticleBodyCache.objects.get().content_text, "v2 text")
+
+
+class IncrementalRefreshTest(TestCase):
+    """Stories kept from the previous batch reuse fresh cached bodies."""
+
+    def setUp(self):
+        summarizer = mock.Mock()
+        summarizer.summarize_batch.side_effect = lambda texts: [
+            SummaryResult(text=f"summary: {text}", model_name="test") for text in texts
+        ]
+        patcher = mock.patch.object(pipeline, "get_summarizer", return_value=summarizer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.fetched = []
+
+    def _refresh(self, stories, text="body text", fail=False, **kwargs):
+        def fake_fetch_bodies(stories, cache):
+            self.fetched.append(sorted(story.hn_id for story in stories))
+            for story in stories:
+                if fail:
+                    cached = cache.get(story.url)
+                    story.body = replace(cached, changed=False, stale=True) if cached else ArticleBody()
+                else:
+                    story.body = ArticleBody(text, f"hash-{text}")
+                story.content_text = story.body.text
+
+        with mock.patch.object(pipeline, "fetch_front_page", return_value=stories), \
+                mock.patch.object(pipeline, "fetch_article_bodies", side_effect=fake_fetch_bodies):
+            return pipeline.refresh_top_articles_and_summaries(limit=len(stories), **kwargs)
+
+    def test_only_new_stories_are_fetched(self):
+        self._refresh(_front_page(2))
+        result = self._refresh(_front_page(3))
+        self.assertEqual(self.fetched, [[1, 2], [3]])
+        self.assertEqual((result.bodies_fetched, result.summarized), (1, 1))
+
+    def test_expired_cache_is_refetched(self):
+        self._refresh(_front_page(2))
+        ArticleBodyCache.objects.filter(url="https://example.com/1").update(
+            fetched_at=timezone.now() - timedelta(days=1)
+        )
+        self._refresh(_front_page(2))
+        self.assertEqual(self.fetched[1], [1])
+        self.assertGreater(ArticleBodyCache.objects.get(url="https://example.com/1").fetched_at,
+                           timezone.now() - timedelta(minutes=1))
+
+    def test_full_refresh_fetches_everything(self):
+        self._refresh(_front_page(2))
+        self._refresh(_front_page(2), incremental=False)
+        self.assertEqual(self.fetched[1], [1, 2])
+
+    def test_summary_fingerprint_decides_resummarizing(self):
+        self._refresh(_front_page(1), text="same text")
+        self.assertEqual(self._refresh(_front_page(1), text="same  text\n", incremental=False).summarized, 0)
+        self.assertEqual(self._refresh(_front_page(1), text="new text", incremental=False).summarized, 1)
+        self.assertEqual(
+            Summary.objects.latest("id").content_fingerprint, pipeline.content_fingerprint("new text")
+        )
+
+    def test_failed_fetch_keeps_existing_summary(self):
+        self._refresh(_front_page(1))
+        ArticleBodyCache.objects.all().delete()
+        result = self._refresh(_front_page(1), fail=True, incremental=False)
+        self.assertEqual(result.summarized, 0)
+        self.assertEqual(Summary.objects.count(), 1)
+
+
+class _FakeEncoding(dict):
+    def to(self, device):
+        return self
+
+
+class _FakeTokenizer:
+    """Counts one token per word; ids are the words themselves."""
+
+    def __call__(self, texts, truncation=True, add_special_tokens=True):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def build_inputs_with_special_tokens(self, ids):
+        return list(ids)
+
+    def pad(self, encoded, return_tensors=None):
+        return _FakeEncoding(encoded)
+
+    def batch_decode(self, outputs, skip_special_tokens=False):
+        return outputs
+
+
+class _FakePipeline:
+    """Stands in for the transformers pipeline; also plays its model."""
+
+    device = "cpu"
+
+    def __init__(self, fail=False):
+        self.tokenizer = _FakeTokenizer()
+        self.model = self
+        self.calls = []
+        self.fail = fail
+
+    def generate(self, input_ids, **kwargs):
+        self.calls.append([" ".join(ids) for ids in input_ids])
+        if self.fail:
+            raise RuntimeError("out of memory")
+        return [f"sum({len(ids)})" for ids in input_ids]
+
+
+class SummarizeBatchTest(SimpleTestCase):
+    def _summarizer(self, fake, **kwargs):
+        with mock.patch.object(LocalSummarizer, "_setup_pipeline"):
+            summarizer = LocalSummarizer(**kwargs)
+        summarizer._pipeline = fake
+        summarizer._model_name = "fake-model"
+        return summarizer
+
+    def test_batches_are_length_sorted_and_within_token_budget(self):
+        fake = _FakePipeline()
+        summarizer = self._summarizer(fake, batch_token_budget=40, max_batch_size=3)
+        texts = [" ".join(["w"] * n) for n in (5, 20, 6, 19, 4, 7)]
+
+        results = summarizer.summarize_batch(texts)
+
+        # Results line up with the inputs even though batches were reordered.
+        self.assertEqual([r.text for r in results], [f"sum({n})" for n in (5, 20, 6, 19, 4, 7)])
+        self.assertEqual([[len(t.split()) for t in call] for call in fake.calls], [[20, 19], [7, 6, 5], [4]])
+        for call in fake.calls:
+            self.assertLessEqual(len(call) * max(len(t.split()) for t in call), 40)
+
+    def test_unknown_cpu_runtime_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self._summarizer(_FakePipeline(), cpu_runtime="tpu")
+
+    def test_empty_inputs_skip_the_model_and_failures_fall_back(self):
+        fake = _FakePipeline(fail=True)
+        summarizer = self._summarizer(fake)
+
+        results = summarizer.summarize_batch(["", "First sentence. Second sentence."])
+
+        self.assertEqual(results[0].text, "No content available.")
+        self.assertEqual(results[1].model_name, "fake-model-fallback")
+        self.assertEqual(len(fake.calls), 1)
+
+
+class MapReduceSummarizeTest(SimpleTestCase):
+    def _summarizer(self, fake, **kwargs):
+        with mock.patch.object(LocalSummarizer, "_setup_pipeline"):
+            summarizer = LocalSummarizer(map_reduce=True, **kwargs)
+        summarizer._pipeline = fake
+        summarizer._model_name = "fake-model"
+        return summarizer
+
+    def test_long_text_is_chunked_on_sentences_then_reduced(self):
+        fake = _FakePipeline()
+        summarizer = self._summarizer(fake, chunk_tokens=6)
+        text = "one two three. four five. six seven eight nine. ten."
+
+        result = summarizer.summarize(text)
+
+        self.assertEqual(
+            sorted(fake.calls[0]), sorted(["one two three. four five.", "six seven eight nine. ten."])
+        )
+        self.assertEqual(fake.calls[1], ["sum(5) sum(5)"])
+        self.assertEqual(result.text, "sum(2)")
+
+    def test_short_text_skips_the_reduce_step(self):
+        fake = _FakePipeline()
+        result = self._summarizer(fake, chunk_tokens=50).summarize("one two. three.")
+        self.assertEqual(fake.calls, [["one two. three."]])
+        self.assertEqual(result.text, "sum(3)")
+
+    def test_chunk_count_is_capped_and_long_sentences_are_cut(self):
+        fake = _FakePipeline()
+        summarizer = self._summarizer(fake, chunk_tokens=4, max_chunks=2)
+        summarizer.summarize(" ".join(f"w{n}" for n in range(20)) + ".")
+        self.assertEqual(sorted(fake.calls[0]), ["w0 w1 w2 w3", "w4 w5 w6 w7"])
+
+    def test_failed_chunk_falls_back(self):
+        result = self._summarizer(_FakePipeline(fail=True), chunk_tokens=4).summarize("one two three. four five six.")
+        self.assertEqual(result.model_name, "fake-model-fallback")
+
+
+class SummaryCacheTest(TestCase):
+    def _summarizer(self, fake, cache):
+        with mock.patch.object(LocalSummarizer, "_setup_pipeline"):
+            summarizer = LocalSummarizer(cache=cache)
+        summarizer._pipeline = fake
+        summarizer._model_name = "fake-model"
+        return summarizer
+
+    def test_repeated_inputs_run_the_model_once(self):
+        fake = _FakePipeline()
+        summarizer = self._summarizer(fake, SummaryCache(persist=False))
+
+        first = summarizer.summarize_batch(["one two", "one  two", "three"])
+        second = summarizer.summarize_batch(["three", "one two"])
+
+        self.assertEqual([r.text for r in first], ["sum(2)", "sum(2)", "sum(1)"])
+        self.assertEqual([r.text for r in second], ["sum(1)", "sum(2)"])
+        self.assertEqual(sorted(len(call) for call in fake.calls), [2])
+        self.assertFalse(SummaryCacheEntry.objects.exists())
+
+    def test_database_tier_outlives_the_process_cache(self):
+        self._summarizer(_FakePipeline(), SummaryCache()).summarize_batch(["one two"])
+        self.assertEqual(SummaryCacheEntry.objects.get().model_name, "fake-model")
+
+        fake = _FakePipeline()
+        result = self._summarizer(fake, SummaryCache()).summarize(" one two ")
+        self.assertEqual(result.text, "sum(2)")
+        self.assertEqual(fake.calls, [])
+
+    def test_key_depends_on_model_and_params(self):
+        fake = _FakePipeline()
+        summarizer = self._summarizer(fake, SummaryCache())
+        summarizer.summarize_batch(["one two"])
+        summarizer.summarize_batch(["one two"], max_words=40)
+        summarizer._model_name = "other-model"
+        summarizer.summarize_batch(["one two"])
+        self.assertEqual(len(fake.calls), 3)
+
+    def test_failures_are_not_cached(self):
+        cache = SummaryCache()
+        self._summarizer(_FakePipeline(fail=True), cache).summarize("one two")
+        self.assertEqual(len(cache), 0)
+        self.assertFalse(SummaryCacheEntry.objects.exists())
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = SummaryCache(max_entries=2, persist=False)
+        cache.set_many({"a": "A", "b": "B"}, "m")
+        cache.get_many(["a"])
+        cache.set_many({"c": "C"}, "m")
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": "A", "c": "C"})
+
+
+class PipelineSetupTest(SimpleTestCase):
+    """What ``_setup_pipeline`` hands to ``transformers.pipeline``."""
+
+    def setUp(self):
+        self.torch = mock.MagicMock()
+        self.torch.backends.mps.is_available.return_value = False
+        self.torch.cuda.is_available.return_value = False
+        self.torch.__version__ = "2.4.0"
+        self.transformers = mock.MagicMock()
+        self.transformers.__version__ = "4.44.0"
+        modules = mock.patch.dict(sys.modules, {"torch": self.torch, "transformers": self.transformers})
+        modules.start()
+        self.addCleanup(modules.stop)
+
+    def _summarizer(self, **kwargs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            return LocalSummarizer(model_cache_dir=cache_dir, **kwargs)
+
+    def test_pytorch_runtime_loads_the_configured_model(self):
+        summarizer = self._summarizer(model_id="/models/distilbart")
+
+        self.transformers.pipeline.assert_called_once_with(
+            "summarization", model="/models/distilbart", device=-1, dtype=self.torch.float32
+        )
+        self.assertEqual(summarizer.model_name, "distilbart (cpu)")
+
+    def test_quantized_runtime_passes_the_int8_model(self):
+        quantized = self.torch.ao.quantization.quantize_dynamic.return_value
+
+        summarizer = self._summarizer(model_id="sshleifer/distilbart-cnn-6-6", cpu_runtime="quantized")
+
+        self.transformers.AutoModelForSeq2SeqLM.from_pretrained.assert_called_once_with("sshleifer/distilbart-cnn-6-6")
+        self.transformers.pipeline.assert_called_once_with(
+            "summarization", model=quantized, tokenizer="sshleifer/distilbart-cnn-6-6", device=-1
+        )
+        self.assertEqual(summarizer.model_name, "distilbart-cnn-6-6 (cpu, quantized)")
+
+    def test_int8_cache_is_keyed_on_library_versions(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            LocalSummarizer(model_id="org/model", cpu_runtime="quantized", model_cache_dir=cache_dir)
+        path = self.torch.save.call_args.args[1]
+        self.assertEqual(path.name, "int8-torch2.4.0-transformers4.44.0.pt")
+        self.assertEqual(path.parent.name, "org--model")
+
+    def test_unreadable_int8_cache_is_deleted_and_pytorch_used(self):
+        self.torch.load.side_effect = RuntimeError("incompatible pickle")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = Path(cache_dir) / "org--model" / "int8-torch2.4.0-transformers4.44.0.pt"
+            path.parent.mkdir()
+            path.write_bytes(b"stale")
+
+            summarizer = LocalSummarizer(model_id="org/model", cpu_runtime="quantized", model_cache_dir=cache_dir)
+
+            self.assertFalse(path.exists())
+        self.transformers.pipeline.assert_called_once_with(
+            "summarization", model="org/model", device=-1, dtype=self.torch.float32
+        )
+        self.assertEqual(summarizer.model_name, "model (cpu)")
+
+    def test_configured_pipeline_runs_summarize_batch(self):
+        summarizer = self._summarizer()
+        summarizer._pipeline = _FakePipeline()
+        self.assertEqual([r.text for r in summarizer.summarize_batch(["one two three"])], ["sum(3)"])
+
+
+class ExtractiveSummarizerTest(SimpleTestCase):
+    TEXT = (
+        "Rust adds a new borrow checker. "
+        "The weather was nice on Tuesday. "
+        "The borrow checker rejects fewer valid Rust programs. "
+        "Rust programs compile faster with the new borrow checker."
+    )
+
+    def test_central_sentences_win_and_keep_their_order(self):
+        result = summarizer_module.ExtractiveSummarizer().summarize(self.TEXT, max_words=20)
+        chosen = extractive.split_sentences(result.text)
+        self.assertEqual(len(chosen), 2)
+        self.assertNotIn("The weather was nice on Tuesday.", chosen)
+        sentences = extractive.split_sentences(self.TEXT)
+        self.assertEqual(chosen, sorted(chosen, key=sentences.index))
+        self.assertEqual(result.model_name, "textrank-extractive")
+
+    def test_degenerate_inputs(self):
+        engine = summarizer_module.ExtractiveSummarizer()
+        results = engine.summarize_batch(["", "one two three four", "Same. Same. Same."], max_words=2)
+        self.assertEqual([r.text for r in results], ["No content available.", "one two...", "Same. Same."])
+
+    def test_backend_is_chosen_by_setting(self):
+        summarizer_module.reset_summarizer()
+        self.addCleanup(summarizer_module.reset_summarizer)
+        with self.settings(NEWS_SUMMARIZER_BACKEND="extractive"), \
+                mock.patch.object(LocalSummarizer, "_setup_pipeline") as setup:
+            shared = summarizer_module.get_summarizer()
+        self.assertIsInstance(shared, summarizer_module.ExtractiveSummarizer)
+        setup.assert_not_called()
+
+        summarizer_module.reset_summarizer()
+        with self.settings(NEWS_SUMMARIZER_BACKEND="nope"):
+            with self.assertRaises(ImproperlyConfigured):
+                summarizer_module.get_summarizer()
+
+
+class SummarizerTierTest(TestCase):
+    TIERS = {
+        "fast": {"MODEL": "/models/distilbart", "SECONDS_PER_STORY": 0.5},
+        "quality": {"MODEL": "facebook/bart-large-cnn", "SECONDS_PER_STORY": 2.0},
+    }
+
+    def setUp(self):
+        summarizer_module.reset_summarizer()
+        self.addCleanup(summarizer_module.reset_summarizer)
+        overrides = self.settings(NEWS_SUMMARIZER_TIERS=self.TIERS, NEWS_SUMMARIZER_DEFAULT_TIER="fast")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_best_tier_that_fits_the_budget_is_chosen(self):
+        self.assertEqual(summarizer_module.select_tier(30, latency_budget=100), "quality")
+        self.assertEqual(summarizer_module.select_tier(30, latency_budget=20), "fast")
+        self.assertEqual(summarizer_module.select_tier(30, latency_budget=1), "fast")
+        self.assertEqual(summarizer_module.select_tier(30), "fast")
+
+    def test_measured_speed_replaces_the_estimate(self):
+        with mock.patch.object(LocalSummarizer, "_setup_pipeline"):
+            quality = summarizer_module.get_summarizer("quality")
+        quality.seconds_per_input = 10.0
+        self.assertEqual(summarizer_module.select_tier(30, latency_budget=100), "fast")
+
+    def test_each_tier_loads_its_own_model(self):
+        with mock.patch.object(LocalSummarizer, "_setup_pipeline"):
+            fast = summarizer_module.get_summarizer("fast")
+            quality = summarizer_module.get_summarizer("quality")
+        self.assertEqual((fast._model_id, fast.tier), ("/models/distilbart", "fast"))
+        self.assertEqual((quality._model_id, quality.tier), ("facebook/bart-large-cnn", "quality"))
+        with self.assertRaises(ImproperlyConfigured):
+            summarizer_module.get_summarizer("huge")
+
+    def test_each_tier_passes_its_model_to_the_pipeline(self):
+        torch = mock.MagicMock()
+        torch.backends.mps.is_available.return_value = False
+        torch.cuda.is_available.return_value = False
+        transformers = mock.MagicMock()
+        with mock.patch.dict(sys.modules, {"torch": torch, "transformers": transformers}):
+            fast = summarizer_module.get_summarizer("fast")
+            quality = summarizer_module.get_summarizer("quality")
+
+        models = [call.kwargs["model"] for call in transformers.pipeline.call_args_list]
+        self.assertEqual(models, ["/models/distilbart", "facebook/bart-large-cnn"])
+        self.assertEqual((fast.model_name, quality.model_name), ("distilbart (cpu)", "bart-large-cnn (cpu)"))
+
+    def test_streaming_refresh_sizes_the_tier_by_changed_stories(self):
+        chosen = []
+        summarizer = mock.Mock()
+        summarizer.summarize_batch.side_effect = lambda texts: [
+            SummaryResult(text="s", model_name="test") for _ in texts
+        ]
+
+        def get_summarizer(tier):
+            chosen.append(tier)
+            return summarizer
+
+        def refresh(stories):
+            with mock.patch.object(pipeline, "get_summarizer", side_effect=get_summarizer), \
+                    mock.patch.object(pipeline, "fetch_front_page", return_value=stories), \
+                    mock.patch.object(pipeline, "iter_article_bodies", side_effect=lambda stories, cache: iter(stories)):
+                pipeline.refresh_top_articles_and_summaries(limit=len(stories), latency_budget=20, streaming=True)
+
+        refresh(_front_page(30))
+        # Two new stories fit the quality tier's budget; all 30 would not.
+        refresh(_front_page(28) + _front_page(2, offset=100))
+
+        self.assertEqual(chosen, ["fast", "quality"])
+
+    def test_resummarize_pass_uses_the_quality_tier(self):
+        fast = mock.Mock()
+        fast.summarize_batch.side_effect = lambda texts: [
+            SummaryResult(text="fast", model_name="distilbart", tier="fast") for _ in texts
+        ]
+        quality = mock.Mock()
+        quality.summarize_batch.side_effect = lambda texts: [
+            SummaryResult(text="good", model_name="bart", tier="quality") for _ in texts
+        ]
+        tiers = {"fast": fast, "quality": quality}
+        with mock.patch.object(pipeline, "get_summarizer", side_effect=lambda tier: tiers[tier]), \
+                mock.patch.object(pipeline, "fetch_front_page", return_value=_front_page(2)), \
+                mock.patch.object(pipeline, "fetch_article_bodies"):
+            pipeline.refresh_top_articles_and_summaries(limit=2, latency_budget=1)
+            self.assertEqual(pipeline.resummarize_latest_batch("quality"), 2)
+            self.assertEqual(pipeline.resummarize_latest_batch("quality"), 0)
+
+        self.assertEqual(
+            list(Summary.objects.order_by("id").values_list("tier", flat=True)), ["fast", "fast", "quality", "quality"]
+        )
+        response = self.client.get("/api/summaries/", {"tier": "quality"})
+        self.assertEqual([s["summary_text"] for s in response.json()["results"]], ["good", "good"])
+
+
+class SharedSummarizerTest(SimpleTestCase):
+    def setUp(self):
+        summarizer_module.reset_summarizer()
+        self.addCleanup(summarizer_module.reset_summarizer)
+
+    def test_model_loads_once_across_threads(self):
+        with mock.patch.object(LocalSummarizer, "_setup_pipeline") as setup:
+            seen = []
+            threads = [
+                threading.Thread(target=lambda: seen.append(summarizer_module.get_summarizer()))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(setup.call_count, 1)
+        self.assertEqual(len({id(s) for s in seen}), 1)
+        self.assertGreaterEqual(seen[0].load_seconds, 0)
+
+    def test_warm_up_runs_a_dummy_input(self):
+        with mock.patch.object(LocalSummarizer, "_setup_pipeline"):
+            shared = summarizer_module.get_summarizer()
+        with mock.patch.object(shared, "summarize") as summarize:
+            summarizer_module.warm_up()
+        summarize.assert_called_once_with(summarizer_module.WARM_UP_TEXT)
+
+
+class RefreshJobTest(APITestCase):
+    def test_post_enqueues_a_job_and_coalesces_concurrent_requests(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            first = self.client.post('/api/refresh/')
+            second = self.client.post('/api/refresh/')
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(first.data['status'], 'queued')
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(RefreshJob.objects.count(), 1)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_post_passes_the_story_source_to_the_refresh(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post('/api/refresh/', {'source': 'api'}, format='json')
+        self.assertEqual(response.data['source'], 'api')
+
+        with mock.patch.object(jobs, "refresh_top_articles_and_summaries") as refresh:
+            refresh.return_value = pipeline.RefreshResult(created=0, updated=0, summarized=0)
+            jobs.run_refresh_job(response.data['id'])
+        self.assertEqual(refresh.call_args.kwargs['source'], 'api')
+
+        self.assertEqual(self.client.post('/api/refresh/?source=rss').status_code, 400)
+
+    def test_job_runs_and_reports_progress(self):
+        job, created = jobs.enqueue_refresh(limit=5)
+        self.assertTrue(created)
+
+        def fake_refresh(limit, progress, **kwargs):
+            progress(stories_fetched=5)
+            progress(stories_summarized=2)
+            return pipeline.RefreshResult(created=3, updated=2, summarized=2)
+
+        with mock.patch.object(jobs, "refresh_top_articles_and_summaries", side_effect=fake_refresh):
+            jobs.run_refresh_job(job.pk)
+
+        response = self.client.get(f'/api/refresh/{job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'succeeded')
+        self.assertEqual(response.data['stories_fetched'], 5)
+        self.assertEqual(response.data['stories_summarized'], 2)
+        self.assertEqual(response.data['articles_created'], 3)
+
+        # Once finished, a new request starts a fresh job.
+        next_job, created = jobs.enqueue_refresh()
+        self.assertTrue(created)
+        self.assertNotEqual(next_job.pk, job.pk)
+
+    def test_failed_job_records_errors(self):
+        job, _ = jobs.enqueue_refresh()
+        with mock.patch.object(jobs, "refresh_top_articles_and_summaries", side_effect=RuntimeError("boom")):
+            jobs.run_refresh_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.Status.FAILED)
+        self.assertEqual(job.errors, ["boom"])
+        self.assertIsNone(job.active)
+
+    def test_stale_active_job_does_not_block_new_ones(self):
+        stale, _ = jobs.enqueue_refresh()
+        RefreshJob.objects.filter(pk=stale.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        job, created = jobs.enqueue_refresh()
+
+        self.assertTrue(created)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, RefreshJob.Status.FAILED)
+
+    def test_long_running_job_with_a_heartbeat_is_kept(self):
+        running, _ = jobs.enqueue_refresh()
+        RefreshJob.objects.filter(pk=running.pk).update(
+            status=RefreshJob.Status.RUNNING,
+            created_at=timezone.now() - timedelta(hours=1),
+            started_at=timezone.now() - timedelta(hours=1),
+            heartbeat_at=timezone.now(),
+        )
+
+        job, created = jobs.enqueue_refresh()
+
+        self.assertFalse(created)
+        self.assertEqual(job.pk, running.pk)
+
+
+class RefreshJobHeartbeatTest(TransactionTestCase):
+    def test_running_job_keeps_beating(self):
+        # Created directly: enqueue_refresh would also submit it to the executor.
+        job = RefreshJob.objects.create(heartbeat_at=timezone.now() - timedelta(hours=1))
+        beats = []
+
+        def slow_refresh(**kwargs):
+            started = RefreshJob.objects.get(pk=job.pk).heartbeat_at
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                time.sleep(0.02)
+                beat = RefreshJob.objects.get(pk=job.pk).heartbeat_at
+                if beat > started:
+                    beats.append(beat)
+                    break
+            return pipeline.RefreshResult(created=0, updated=0, summarized=0)
+
+        with mock.patch.object(jobs, "HEARTBEAT_INTERVAL", 0.01), \
+                mock.patch.object(jobs, "refresh_top_articles_and_summaries", side_effect=slow_refresh):
+            jobs.run_refresh_job(job.pk)
+
+        self.assertEqual(len(beats), 1)
+        self.assertEqual(RefreshJob.objects.get(pk=job.pk).status, RefreshJob.Status.SUCCEEDED)
+
+
+def _read_events(response):
+    """Parse a server-sent event stream into ``(event, id, data)`` tuples."""
+    body = b"".join(response.streaming_content).decode()
+    parsed = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if "event" in fields:
+            parsed.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return parsed
+
+
+@override_settings(NEWS_EVENT_STREAM={'POLL_INTERVAL': 0, 'MAX_DURATION': 5})
+class RefreshEventsTest(TestCase):
+    def setUp(self):
+        self.article = Article.objects.create(hn_id=1, title="Story", url="https://example.com/1")
+        self.job = RefreshJob.objects.create(limit=2)
+
+    def _finish_job(self):
+        RefreshJob.objects.filter(pk=self.job.pk).update(
+            status=RefreshJob.Status.SUCCEEDED, active=None, stories_summarized=2, finished_at=timezone.now()
+        )
+
+    def test_finished_job_streams_its_summaries_then_done(self):
+        first = Summary.objects.create(article=self.article, summary_text="One", model_name="m")
+        second = Summary.objects.create(article=self.article, summary_text="Two", model_name="m")
+        self._finish_job()
+
+        response = self.client.get(f'/api/refresh/{self.job.pk}/events/', HTTP_ACCEPT='text/event-stream')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = _read_events(response)
+        self.assertEqual([event for event, _, _ in events], ['progress', 'summary', 'summary', 'done'])
+        self.assertEqual(events[1][1], str(first.pk))
+        self.assertEqual(events[1][2]['summary_text'], "One")
+        self.assertEqual(events[1][2]['article'], self.article.pk)
+        self.assertEqual(events[2][1], str(second.pk))
+        self.assertEqual(events[3][2]['status'], 'succeeded')
+
+    def test_reconnect_resumes_after_last_event_id(self):
+        first = Summary.objects.create(article=self.article, summary_text="One", model_name="m")
+        Summary.objects.create(article=self.article, summary_text="Two", model_name="m")
+        self._finish_job()
+
+        response = self.client.get(f'/api/refresh/{self.job.pk}/events/', HTTP_LAST_EVENT_ID=str(first.pk))
+
+        summaries = [data['summary_text'] for event, _, data in _read_events(response) if event == 'summary']
+        self.assertEqual(summaries, ["Two"])
+
+    def test_running_job_streams_summaries_as_they_are_written(self):
+        RefreshJob.objects.filter(pk=self.job.pk).update(status=RefreshJob.Status.RUNNING)
+        steps = iter([
+            lambda: Summary.objects.create(article=self.article, summary_text="One", model_name="m"),
+            lambda: RefreshJob.objects.filter(pk=self.job.pk).update(stories_summarized=1),
+            self._finish_job,
+        ])
+
+        # Each poll of the stream sees the pipeline one step further along.
+        with mock.patch.object(events.time, "sleep", side_effect=lambda seconds: next(steps)()):
+            response = self.client.get(f'/api/refresh/{self.job.pk}/events/')
+            received = _read_events(response)
+
+        self.assertEqual(
+            [(event, data.get('status'), data.get('stories_summarized')) for event, _, data in received],
+            [
+                ('progress', 'running', 0),
+                ('summary', None, None),
+                ('progress', 'running', 1),
+                ('progress', 'succeeded', 2),
+                ('done', 'succeeded', 2),
+            ],
+        )
+
+    def test_unknown_job_is_404(self):
+        response = self.client.get('/api/refresh/999/events/')
+        self.assertEqual(response.status_code, 404)
+
+
+def _front_page(count, offset=0):
+    return [
+        Story(
+            hn_id=offset + i,
+            title=f"Story {offset + i}",
+            url=f"https://example.com/{offset + i}",
+            author="someone",
+            points=i,
+            comments_count=0,
+            rank=i,
+            content_text=f"Body of story {offset + i}.",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+class RefreshStagesTest(TransactionTestCase):
+    def _refresh(self, stories, summarize_batch):
+        summarizer = mock.Mock()
+        summarizer.summarize_batch.side_effect = summarize_batch
+        with mock.patch.object(pipeline, "fetch_front_page", return_value=stories), \
+                mock.patch.object(pipeline, "fetch_article_bodies"), \
+                mock.patch.object(pipeline, "get_summarizer", return_value=summarizer):
+            return pipeline.refresh_top_articles_and_summaries(limit=len(stories))
+
+    @staticmethod
+    def _summaries(texts):
+        return [SummaryResult(text=text, model_name="test") for text in texts]
+
+    def test_inference_runs_outside_a_transaction(self):
+        def summarize_batch(texts):
+            self.assertFalse(connection.in_atomic_block)
+            return self._summaries(texts)
+
+        result = self._refresh(_front_page(3), summarize_batch)
+
+        self.assertEqual((result.created, result.updated, result.summarized), (3, 0, 3))
+        self.assertEqual(Summary.objects.count(), 3)
+        batch = ScrapeBatch.objects.get(pk=result.batch_id)
+        self.assertEqual(list(batch.entries.values_list('rank', flat=True)), [1, 2, 3])
+
+    def test_query_count_does_not_grow_with_story_count(self):
+        counts = []
+        for size, offset in ((3, 0), (12, 100)):
+            with CaptureQueriesContext(connection) as queries:
+                self._refresh(_front_page(size, offset), self._summaries)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_existing_articles_are_updated_in_bulk(self):
+        self._refresh(_front_page(3), self._summaries)
+        stories = _front_page(3)
+        stories[0].points = 500
+
+        result = self._refresh(stories, self._summaries)
+
+        self.assertEqual((result.created, result.updated, result.summarized), (0, 3, 0))
+        self.assertEqual(Article.objects.get(hn_id=1).points, 500)
+
+
+class StreamingRefreshTest(TestCase):
+    def _refresh(self, stories, fetch_bodies, summarize_batch, progress=None):
+        summarizer = mock.Mock()
+        summarizer.summarize_batch.side_effect = summarize_batch
+        with mock.patch.object(pipeline, "fetch_front_page", return_value=stories), \
+                mock.patch.object(pipeline, "iter_article_bodies", side_effect=fetch_bodies), \
+                mock.patch.object(pipeline, "get_summarizer", return_value=summarizer):
+            return pipeline.refresh_top_articles_and_summaries(
+                limit=len(stories), progress=progress, streaming=True
+            )
+
+    def test_stages_overlap_and_stories_commit_one_by_one(self):
+        first_summarized = threading.Event()
+        overlapped = []
+        visible = []
+
+        def fetch_bodies(stories, cache):
+            for number, story in enumerate(stories):
+                if number == 1:
+                    # The next body is still "downloading" while the first is summarized.
+                    overlapped.append(first_summarized.wait(timeout=5))
+                yield story
+
+        def summarize_batch(texts):
+            first_summarized.set()
+            return [SummaryResult(text=f"summary of {text}", model_name="test") for text in texts]
+
+        def progress(stories_fetched, stories_summarized):
+            visible.append((stories_fetched, Summary.objects.count(), BatchEntry.objects.count()))
+
+        result = self._refresh(_front_page(3), fetch_bodies, summarize_batch, progress)
+
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(visible, [(1, 1, 1), (2, 2, 2), (3, 3, 3)])
+        self.assertEqual((result.created, result.summarized, result.errors), (3, 3, []))
+        batch = ScrapeBatch.objects.get(pk=result.batch_id)
+        self.assertIsNotNone(batch.finished_at)
+        self.assertEqual(list(batch.entries.order_by("rank").values_list("rank", flat=True)), [1, 2, 3])
+
+    def test_unfinished_batch_stays_off_the_article_list(self):
+        self._refresh(_front_page(2), lambda stories, cache: iter(stories), lambda texts: [
+            SummaryResult(text="s", model_name="test") for _ in texts
+        ])
+
+        during = []
+
+        def progress(**counts):
+            during.append(sorted(a["hn_id"] for a in self.client.get("/api/articles/").json()["results"]))
+
+        self._refresh(_front_page(3, offset=10), lambda stories, cache: iter(stories), lambda texts: [
+            SummaryResult(text="s", model_name="test") for _ in texts
+        ], progress)
+        self.assertEqual(during, [[1, 2]] * 3)
+        list_ids = [a["hn_id"] for a in self.client.get("/api/articles/").json()["results"]]
+        self.assertEqual(sorted(list_ids), [11, 12, 13])
+
+    def test_summarizer_failure_still_saves_stories(self):
+        def summarize_batch(texts):
+            raise RuntimeError("model crashed")
+
+        result = self._refresh(_front_page(2), lambda stories, cache: iter(stories), summarize_batch)
+
+        self.assertEqual(result.errors, ["Summarize failed: model crashed"])
+        self.assertEqual(Summary.objects.count(), 0)
+        self.assertEqual((Article.objects.count(), BatchEntry.objects.count()), (2, 2))
+        self.assertEqual(self.client.get("/api/articles/").json()["count"], 2)
+
+    def test_partial_refresh_is_not_finished(self):
+        self._refresh(_front_page(2), lambda stories, cache: iter(stories), lambda texts: [
+            SummaryResult(text="s", model_name="test") for _ in texts
+        ])
+
+        def fetch_bodies(stories, cache):
+            yield stories[0]
+            raise OSError("network down")
+
+        stories = [replace(story, hn_id=story.hn_id + 10) for story in _front_page(2)]
+        result = self._refresh(stories, fetch_bodies, lambda texts: [
+            SummaryResult(text="s", model_name="test") for _ in texts
+        ])
+
+        self.assertEqual(result.errors, ["Fetch failed: network down"])
+        self.assertIsNone(ScrapeBatch.objects.get(pk=result.batch_id).finished_at)
+        list_ids = [a["hn_id"] for a in self.client.get("/api/articles/").json()["results"]]
+        self.assertEqual(sorted(list_ids), [1, 2])
+
+    def test_summarize_thread_closes_its_connections(self):
+        closed_by = []
+        close_all = pipeline.connections.close_all
+
+        def record_close_all():
+            closed_by.append(threading.current_thread().name)
+            close_all()
+
+        with mock.patch.object(pipeline.connections, "close_all", side_effect=record_close_all):
+            self._refresh(_front_page(2), lambda stories, cache: iter(stories), lambda texts: [
+                SummaryResult(text="s", model_name="test") for _ in texts
+            ])
+
+        self.assertEqual(closed_by, ["refresh-summarize"])
+
+    def test_refresh_that_stores_nothing_keeps_the_previous_page(self):
+        self._refresh(_front_page(2), lambda stories, cache: iter(stories), lambda texts: [
+            SummaryResult(text="s", model_name="test") for _ in texts
+        ])
+
+        def fetch_bodies(stories, cache):
+            raise OSError("network down")
+            yield
+
+        stories = [replace(story, hn_id=story.hn_id + 10) for story in _front_page(2)]
+        result = self._refresh(stories, fetch_bodies, lambda texts: [])
+
+        self.assertEqual(result.errors, ["Fetch failed: network down"])
+        self.assertIsNone(result.batch_id)
+        self.assertEqual(ScrapeBatch.objects.count(), 1)
+        list_ids = [a["hn_id"] for a in self.client.get("/api/articles/").json()["results"]]
+        self.assertEqual(sorted(list_ids), [1, 2])
+
+
+class ArticleListQueryCountTest(APITestCase):
+    def _seed(self, count):
+        articles = Article.objects.bulk_create(
+            [Article(hn_id=i, title=f"Article {i}", rank=i) for i in range(1, count + 1)]
+        )
+        Summary.objects.bulk_create(
+            [
+                Summary(article=article, summary_text=f"Summary {n} of {article.hn_id}", model_name=f"model-{n}")
+                for article in articles
+                for n in (1, 2)
+            ]
+        )
+        batch = ScrapeBatch.objects.create(started_at=timezone.now(), finished_at=timezone.now())
+        BatchEntry.objects.bulk_create(
+            [BatchEntry(batch=batch, article=article, rank=article.rank) for article in articles]
+        )
+
+    def test_list_endpoint_uses_constant_number_of_queries(self):
+        """Thirty articles with summaries are served without per-article queries."""
+        self._seed(30)
+
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/articles/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 30)
+        for article in response.data['results']:
+            self.assertEqual(article['latest_summary']['model_name'], 'model-2')
+
+
+class ScrapeBatchTest(APITestCase):
+    def _batch(self, ranking, started_at, finished=True):
+        batch = ScrapeBatch.objects.create(
+            started_at=started_at,
+            finished_at=started_at + timedelta(minutes=10) if finished else None,
+        )
+        for rank, (hn_id, points) in enumerate(ranking, start=1):
+            article, _ = Article.objects.get_or_create(hn_id=hn_id, defaults={'title': f"Story {hn_id}"})
+            BatchEntry.objects.create(batch=batch, article=article, rank=rank, points=points)
+        return batch
+
+    def _hn_ids(self, response):
+        return [article['hn_id'] for article in response.data['results']]
+
+    def test_list_shows_latest_finished_batch_in_rank_order(self):
+        now = timezone.now()
+        self._batch([(1, 10), (2, 20)], now - timedelta(hours=2))
+        # A refresh slower than the old 5-minute window still forms one batch.
+        self._batch([(3, 30), (1, 40), (4, 50)], now - timedelta(hours=1))
+        self._batch([(5, 60)], now, finished=False)
+
+        response = self.client.get('/api/articles/')
+
+        self.assertEqual(self._hn_ids(response), [3, 1, 4])
+        self.assertEqual([a['rank'] for a in response.data['results']], [1, 2, 3])
+
+    def test_historical_batch_keeps_its_own_ranking(self):
+        now = timezone.now()
+        old = self._batch([(1, 10), (2, 20)], now - timedelta(hours=2))
+        self._batch([(2, 25), (1, 15)], now - timedelta(hours=1))
+
+        response = self.client.get(f'/api/articles/?batch={old.pk}')
+
+        self.assertEqual(self._hn_ids(response), [1, 2])
+        self.assertEqual([a['points'] for a in response.data['results']], [10, 20])
+
+        batches = self.client.get('/api/batches/').data['results']
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(batches[1]['id'], old.pk)
+
+    def test_invalid_or_unknown_batch(self):
+        self.assertEqual(self.client.get('/api/articles/?batch=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/articles/?batch=999').status_code, 404)
+
+
+class ResponseCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.article = Article.objects.create(hn_id=1, title="Cached story", rank=1)
+
+    def test_repeat_requests_are_served_from_cache(self):
+        first = self.client.get('/api/articles/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/articles/')
+        self.assertEqual(second.data, first.data)
+
+    def test_conditional_requests_get_not_modified(self):
+        response = self.client.get(f'/api/articles/{self.article.pk}/')
+        self.assertIn('Last-Modified', response)
+
+        not_modified = self.client.get(f'/api/articles/{self.article.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        since = self.client.get(f'/api/articles/{self.article.pk}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+    def test_writes_invalidate_cached_responses(self):
+        before = self.client.get('/api/articles/')
+        Summary.objects.create(article=self.article, summary_text="Fresh summary", model_name="test")
+
+        after = self.client.get('/api/articles/', HTTP_IF_NONE_MATCH=before['ETag'])
+
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertEqual(after.data['results'][0]['latest_summary']['summary_text'], "Fresh summary")
+
+    def test_refresh_persist_invalidates_after_commit(self):
+        before = self.client.get('/api/articles/')
+        with self.captureOnCommitCallbacks(execute=True):
+            pipeline._persist(_front_page(2), {}, [], timezone.now())
+
+        after = self.client.get('/api/articles/')
+
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertEqual([a['hn_id'] for a in after.data['results']], [1, 2])
+
+    def test_invalidation_from_another_process_is_seen(self):
+        """A write by ``manage.py fetch_hn`` reaches the server's cached responses."""
+        backend = 'django.core.cache.backends.filebased.FileBasedCache'
+        command = 'from news.cache import invalidate_responses; invalidate_responses()'
+        with tempfile.TemporaryDirectory() as location, \
+                self.settings(CACHES={'default': {'BACKEND': backend, 'LOCATION': location}}):
+            before = self.client.get('/api/articles/')
+            subprocess.run(
+                [sys.executable, 'manage.py', 'shell', '-c', command],
+                cwd=settings.BASE_DIR,
+                env={**os.environ, 'DJANGO_CACHE_BACKEND': backend, 'DJANGO_CACHE_LOCATION': location},
+                check=True,
+            )
+            after = self.client.get('/api/articles/', HTTP_IF_NONE_MATCH=before['ETag'])
+
+        self.assertEqual(after.status_code, 200)
+
+
+class LeanArticleListTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.article = Article.objects.create(hn_id=1, title="Long read", rank=1, content_text="body " * 800)
+
+    def test_list_neither_loads_nor_serializes_content_text(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/articles/')
+
+        self.assertNotIn('content_text', response.data['results'][0])
+        article_queries = [q['sql'] for q in queries if 'FROM "news_article"' in q['sql']]
+        self.assertTrue(article_queries)
+        for sql in article_queries:
+            self.assertNotIn('"content_text"', sql)
+
+    def test_detail_keeps_full_text(self):
+        response = self.client.get(f'/api/articles/{self.article.pk}/')
+        self.assertEqual(response.data['content_text'], self.article.content_text)
+
+    def test_sparse_fieldsets(self):
+        response = self.client.get('/api/articles/?fields=id,title')
+        self.assertEqual(response.data['results'], [{'id': self.article.pk, 'title': "Long read"}])
+
+        detail = self.client.get(f'/api/articles/{self.article.pk}/?fields=title,content_text')
+        self.assertEqual(set(detail.data), {'title', 'content_text'})
+
+
+class SummaryCursorPaginationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.first = Article.objects.create(hn_id=1, title="First", rank=1)
+        self.second = Article.objects.create(hn_id=2, title="Second", rank=2)
+        base = timezone.now() - timedelta(days=10)
+        for day in range(10):
+            article = self.first if day % 2 else self.second
+            summary = Summary.objects.create(
+                article=article,
+                summary_text=f"Day {day}",
+                model_name="large" if day < 5 else "small",
+            )
+            Summary.objects.filter(pk=summary.pk).update(generated_at=base + timedelta(days=day))
+        self.base = base
+
+    def _texts(self, response):
+        return [summary['summary_text'] for summary in response.data['results']]
+
+    def test_cursor_pages_walk_the_history_in_order(self):
+        seen = []
+        url = '/api/summaries/?page_size=4'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(self._texts(response))
+            url = response.data['next']
+        self.assertEqual(seen, [f"Day {day}" for day in range(10)])
+
+    def test_filters(self):
+        since = (self.base + timedelta(days=3)).date().isoformat()
+        until = (self.base + timedelta(days=7)).date().isoformat()
+
+        by_range = self.client.get(f'/api/summaries/?since={since}&until={until}')
+        self.assertEqual(self._texts(by_range), [f"Day {day}" for day in range(3, 8)])
+
+        by_model = self.client.get('/api/summaries/?model_name=small')
+        self.assertEqual(self._texts(by_model), [f"Day {day}" for day in range(5, 10)])
+
+        by_article = self.client.get(f'/api/summaries/?article={self.first.pk}')
+        self.assertEqual(self._texts(by_article), [f"Day {day}" for day in (1, 3, 5, 7, 9)])
+
+        self.assertEqual(self.client.get('/api/summaries/?since=yesterday').status_code, 400)
+
+
+class AsyncReadEndpointTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        batch = ScrapeBatch.objects.create(started_at=timezone.now(), finished_at=timezone.now())
+        base = timezone.now() - timedelta(days=5)
+        for rank in range(1, 4):
+            article = Article.objects.create(hn_id=rank, title=f"Story {rank}", rank=rank, content_text="Body")
+            BatchEntry.objects.create(batch=batch, article=article, rank=rank, points=rank * 10)
+            summary = Summary.objects.create(article=article, summary_text=f"Summary {rank}", model_name="m")
+            Summary.objects.filter(pk=summary.pk).update(generated_at=base + timedelta(days=rank))
+        self.article = Article.objects.get(hn_id=1)
+
+    async def test_article_endpoints_match_the_drf_ones(self):
+        for drf_url, async_url in (
+            ('/api/articles/', '/api/async/articles/'),
+            ('/api/articles/?fields=id,title', '/api/async/articles/?fields=id,title'),
+            (f'/api/articles/{self.article.pk}/', f'/api/async/articles/{self.article.pk}/'),
+        ):
+            expected = await self.async_client.get(drf_url)
+            response = await self.async_client.get(async_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), expected.json())
+
+        missing = await self.async_client.get('/api/async/articles/999/')
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_invalid_or_unknown_batch(self):
+        invalid = await self.async_client.get('/api/async/articles/?batch=abc')
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(invalid.json(), {'batch': 'Expected a batch id.'})
+        unknown = await self.async_client.get('/api/async/articles/?batch=999')
+        self.assertEqual(unknown.status_code, 404)
+
+    async def test_articles_are_cached_and_revalidated(self):
+        first = await self.async_client.get('/api/async/articles/')
+        revalidated = await self.async_client.get('/api/async/articles/', headers={'If-None-Match': first['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+    async def test_summary_pages_share_the_drf_cursor(self):
+        seen = []
+        url = '/api/async/summaries/?page_size=2'
+        while url:
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(summary['summary_text'] for summary in response.json()['results'])
+            url = response.json()['next']
+        self.assertEqual(seen, ["Summary 1", "Summary 2", "Summary 3"])
+
+        # A cursor from either endpoint pages the other one the same way.
+        drf_first = (await self.async_client.get('/api/summaries/?page_size=2')).json()
+        async_first = (await self.async_client.get('/api/async/summaries/?page_size=2')).json()
+        self.assertEqual(async_first['next'].replace('/api/async/', '/api/'), drf_first['next'])
+        drf_second = await self.async_client.get(drf_first['next'])
+        async_second = await self.async_client.get(drf_first['next'].replace('/api/', '/api/async/'))
+        self.assertEqual(async_second.json()['results'], drf_second.json()['results'])
+
+        by_article = await self.async_client.get(f'/api/async/summaries/?article={self.article.pk}')
+        self.assertEqual([s['summary_text'] for s in by_article.json()['results']], ["Summary 1"])
+        for query in ('since=yesterday', 'cursor=junk', 'page_size=many'):
+            expected = await self.async_client.get(f'/api/summaries/?{query}')
+            response = await self.async_client.get(f'/api/async/summaries/?{query}')
+            self.assertEqual(response.status_code, expected.status_code)
+
+    @override_settings(NEWS_EVENT_STREAM={'POLL_INTERVAL': 0, 'MAX_DURATION': 5})
+    async def test_event_stream_is_asynchronous_under_asgi(self):
+        job = await RefreshJob.objects.acreate(
+            status=RefreshJob.Status.SUCCEEDED, active=None, finished_at=timezone.now()
+        )
+
+        response = await self.async_client.get(f'/api/refresh/{job.pk}/events/')
+
+        self.assertTrue(response.is_async)
+        body = "".join([chunk.decode() async for chunk in response.streaming_content])
+        self.assertIn("event: progress", body)
+        self.assertIn("event: done", body)
+
+
+class DatabaseSettingsTest(SimpleTestCase):
+    def test_sqlite_is_tuned_unless_disabled(self):
+        database = database_settings({'SQLITE_MMAP_SIZE': '0'}, '/tmp/db.sqlite3')
+
+        self.assertEqual(database['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertFalse(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('PRAGMA journal_mode=WAL', database['OPTIONS']['init_command'])
+        self.assertIn('PRAGMA mmap_size=0', database['OPTIONS']['init_command'])
+
+        plain = database_settings({'DJANGO_SQLITE_TUNING': '0', 'DJANGO_CONN_MAX_AGE': '60'}, '/tmp/db.sqlite3')
+        self.assertEqual(plain['OPTIONS'], {})
+        self.assertEqual(plain['CONN_MAX_AGE'], 60)
+        self.assertTrue(plain['CONN_HEALTH_CHECKS'])
+
+    def test_database_url_switches_to_postgres(self):
+        database = database_settings(
+            {'DATABASE_URL': 'postgres://ynews:p%40ss@db:5433/news?sslmode=require', 'DATABASE_POOL': '1'},
+            '/tmp/db.sqlite3',
+        )
+
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(
+            (database['NAME'], database['USER'], database['PASSWORD'], database['HOST'], database['PORT']),
+            ('news', 'ynews', 'p@ss', 'db', '5433'),
+        )
+        self.assertEqual(database['OPTIONS'], {'sslmode': 'require', 'pool': True})
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+
+        with self.assertRaises(ImproperlyConfigured):
+            database_settings({'DATABASE_URL': 'mysql://db/news'}, '/tmp/db.sqlite3')
+
+
+class SQLiteConcurrencyTest(SimpleTestCase):
+    """Readers and a second writer against a file database while a refresh holds the write lock."""
+
+    # Connections come from a handler of our own, outside the test database.
+    databases = {'default'}
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # A page cache small enough that the writer spills to the file, which
+        # without WAL locks readers out until it commits.
+        environ = {'DJANGO_SQLITE_PATH': str(Path(directory.name) / 'db.sqlite3'), 'SQLITE_CACHE_SIZE': '10'}
+        self.databases_ = ConnectionHandler({'default': database_settings(environ, None)})
+        self._execute("CREATE TABLE story (id INTEGER PRIMARY KEY, body TEXT)")
+        self._close()
+
+    def _execute(self, sql, params=()):
+        with self.databases_['default'].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _close(self):
+        self.databases_['default'].close()
+
+    def _in_thread(self, work):
+        outcome = {}
+
+        def run():
+            try:
+                started = time.monotonic()
+                outcome['result'] = work()
+                outcome['seconds'] = time.monotonic() - started
+            except Exception as exc:  # noqa: BLE001
+                outcome['error'] = exc
+            finally:
+                self._close()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread, outcome
+
+    def test_readers_and_writers_do_not_fail_during_a_long_write(self):
+        write_started = threading.Event()
+        finish_write = threading.Event()
+
+        def refresh():
+            with transaction.atomic(using='default'), self.databases_['default'].cursor() as cursor:
+                for _ in range(200):
+                    cursor.execute("INSERT INTO story (body) VALUES (?)", ["x" * 4000])
+                write_started.set()
+                finish_write.wait(5)
+
+        # transaction.atomic looks connections up in django.db.connections.
+        with mock.patch('django.db.transaction.connections', self.databases_):
+            writer, written = self._in_thread(refresh)
+            write_started.wait(5)
+
+            reader, read = self._in_thread(lambda: self._execute("SELECT COUNT(*) FROM story"))
+            reader.join(5)
+            second_writer, second = self._in_thread(
+                lambda: self._execute("INSERT INTO story (body) VALUES ('late')")
+            )
+            time.sleep(0.2)
+            finish_write.set()
+            for thread in (writer, second_writer):
+                thread.join(10)
 
+        self.assertNotIn('error', read)
+        # The reader saw the last commit without waiting for the writer.
+        self.assertEqual(read['result'], [(0,)])
+        self.assertLess(read['seconds'], 1)
+        self.assertNotIn('error', written)
+        # The second writer waited for the lock instead of failing.
+        self.assertNotIn('error', second)
+        self.assertEqual(self._execute("SELECT COUNT(*) FROM story"), [(201,)])
+        self._close()
@@ -1,13 +1,29 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import ArticleViewSet, RefreshView, SummaryViewSet
+from .views import (
+    ArticleViewSet,
+    RefreshEventsView,
+    RefreshJobView,
+    RefreshView,
+    ScrapeBatchViewSet,
+    SummaryViewSet,
+    async_article_detail,
+    async_article_list,
+    async_summary_list,
+)
 
 router = DefaultRouter()
 router.register('articles', ArticleViewSet, basename='articles')
 router.register('summaries', SummaryViewSet, basename='summaries')
+router.register('batches', ScrapeBatchViewSet, basename='batches')
 
 urlpatterns = [
     path('refresh/', RefreshView.as_view(), name='refresh'),
+    path('refresh/<int:pk>/', RefreshJobView.as_view(), name='refresh-job'),
+    path('refresh/<int:pk>/events/', RefreshEventsView.as_view(), name='refresh-events'),
+    path('async/articles/', async_article_list, name='async-articles'),
+    path('async/articles/<int:pk>/', async_article_detail, name='async-article-detail'),
+    path('async/summaries/', async_summary_list, name='async-summaries'),
     path('', include(router.urls)),
 ]
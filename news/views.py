@@ -1,64 +1,272 @@
-from django.db.models import Max
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import F, Max
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.utils.decorators import method_decorator
+from django.views import View
 from django.views.decorators.csrf import csrf_exempt
-from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import generics, status, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Article, Summary
-from .serializers import ArticleSerializer, SummarySerializer
-from .services.pipeline import refresh_top_articles_and_summaries
+from .cache import CachedResponseMixin, acached_json_response
+from .models import Article, RefreshJob, ScrapeBatch, Summary
+from .pagination import SummaryCursorPagination
+from .serializers import (
+    ArticleListSerializer,
+    ArticleSerializer,
+    RefreshJobSerializer,
+    ScrapeBatchSerializer,
+    SummarySerializer,
+)
+from .services.events import RefreshEventStream, stream_options
+from .services.jobs import enqueue_refresh
+from .services.scraper import STORY_SOURCES
 
 
-class ArticleViewSet(viewsets.ReadOnlyModelViewSet):
+class ArticleViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = ArticleSerializer
-    
+
+    def get_serializer_class(self):
+        return ArticleListSerializer if self.action == 'list' else ArticleSerializer
+
     def get_queryset(self):
-        """Return only the 30 articles from the most recent scrape batch."""
-        # Get the most recent scrape time
-        latest_scrape = Article.objects.aggregate(Max('scraped_at'))['scraped_at__max']
-        
-        if latest_scrape is None:
-            return Article.objects.none()
-        
-        # Get all articles scraped within 5 minutes of the latest scrape
-        # (they're part of the same batch)
-        from datetime import timedelta
-        cutoff_time = latest_scrape - timedelta(minutes=5)
-        
-        # Return only articles from the latest scrape batch, ordered by rank
-        queryset = Article.objects.prefetch_related("summaries").filter(
-            scraped_at__gte=cutoff_time
-        ).order_by("rank")
-        
-        # For list view, limit to 30
-        if self.action == 'list':
-            return queryset[:30]
-        
-        # For detail view, return all articles (not filtered by scrape time)
-        return Article.objects.prefetch_related("summaries").order_by("rank")
-
-
-class SummaryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Summary.objects.select_related("article").order_by("generated_at")
+        """Return the 30 articles of the latest scrape batch (or ``?batch=<id>``)."""
+        if self.action != 'list':
+            # For detail view, return all articles (not filtered by batch)
+            return Article.objects.with_latest_summary().order_by("rank")
+
+        batch_id = _batch_param(self.request.query_params)
+        if batch_id is not None:
+            batch = get_object_or_404(ScrapeBatch, pk=batch_id)
+        else:
+            batch = ScrapeBatch.objects.filter(finished_at__isnull=False).order_by('-finished_at').first()
+
+        if batch is None:
+            latest_scrape = Article.objects.aggregate(Max('scraped_at'))['scraped_at__max']
+            return _legacy_front_page(latest_scrape)
+        return _batch_front_page(batch)
+
+
+def _batch_param(params) -> Optional[int]:
+    if not params.get('batch'):
+        return None
+    try:
+        return int(params['batch'])
+    except ValueError:
+        raise ValidationError({'batch': 'Expected a batch id.'})
+
+
+def _article_list_queryset():
+    # The list never shows the article body, so do not load it either.
+    return Article.objects.with_latest_summary().defer('content_text')
+
+
+def _batch_front_page(batch: ScrapeBatch):
+    # Ranks and scores as they were when this batch was scraped.
+    return _article_list_queryset().filter(batch_entries__batch=batch).annotate(
+        batch_rank=F('batch_entries__rank'),
+        batch_points=F('batch_entries__points'),
+        batch_comments_count=F('batch_entries__comments_count'),
+    ).order_by('batch_entries__rank')[:30]
+
+
+def _legacy_front_page(latest_scrape: Optional[datetime]):
+    """Guess the latest batch from scrape times, for data scraped before batches existed."""
+    if latest_scrape is None:
+        return Article.objects.none()
+
+    # Articles scraped within 5 minutes of the latest scrape are treated
+    # as one batch.
+    cutoff_time = latest_scrape - timedelta(minutes=5)
+    return _article_list_queryset().filter(
+        scraped_at__gte=cutoff_time
+    ).order_by("rank")[:30]
+
+
+class ScrapeBatchViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """Past refreshes; list a batch's front page with ``/api/articles/?batch=<id>``."""
+
+    queryset = ScrapeBatch.objects.filter(finished_at__isnull=False).order_by('-finished_at')
+    serializer_class = ScrapeBatchSerializer
+
+
+class SummaryViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """Summaries oldest first, paged by cursor.
+
+    Filters: ``since``/``until`` (ISO date or datetime, inclusive),
+    ``model_name``, ``tier`` and ``article`` (article id).
+    """
+
     serializer_class = SummarySerializer
+    pagination_class = SummaryCursorPagination
+
+    def get_queryset(self):
+        queryset = Summary.objects.select_related("article").order_by("generated_at", "id")
+        return _filter_summaries(queryset, self.request.query_params)
+
+
+def _filter_summaries(queryset, params):
+    since = _parse_datetime_param(params, 'since')
+    if since is not None:
+        queryset = queryset.filter(generated_at__gte=since)
+    until = _parse_datetime_param(params, 'until', end_of_day=True)
+    if until is not None:
+        queryset = queryset.filter(generated_at__lte=until)
+    if params.get('model_name'):
+        queryset = queryset.filter(model_name=params['model_name'])
+    if params.get('tier'):
+        queryset = queryset.filter(tier=params['tier'])
+    if params.get('article'):
+        try:
+            queryset = queryset.filter(article_id=int(params['article']))
+        except ValueError:
+            raise ValidationError({'article': 'Expected an article id.'})
+    return queryset
+
+
+def _parse_datetime_param(params, name: str, end_of_day: bool = False) -> Optional[datetime]:
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        # Try the date form first: parse_datetime also accepts bare dates.
+        day = parse_date(value)
+        if day is not None:
+            parsed = datetime.combine(day, time.max if end_of_day else time.min)
+        else:
+            parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(value)
+    except ValueError:
+        raise ValidationError({name: 'Expected an ISO 8601 date or datetime.'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class RefreshView(APIView):
-    """Trigger a scrape + summarize cycle on demand."""
+    """Queue a scrape + summarize cycle; joins the running one if there is one.
+
+    ``source`` (in the body or query string) reads the front page from that
+    story source instead of ``NEWS_STORY_SOURCE``.
+    """
 
-    @extend_schema(responses={200: dict})
+    @extend_schema(
+        request=None,
+        parameters=[OpenApiParameter('source', str, enum=list(STORY_SOURCES))],
+        responses={202: RefreshJobSerializer},
+    )
     def post(self, request):
-        results = refresh_top_articles_and_summaries()
-        return Response(
-            {
-                "created": results.created,
-                "updated": results.updated,
-                "summarized": results.summarized,
-            }
+        source = request.data.get('source') or request.query_params.get('source') or ''
+        if source and source not in STORY_SOURCES:
+            raise ValidationError({'source': f"Expected one of {', '.join(STORY_SOURCES)}."})
+        job, _created = enqueue_refresh(source=source)
+        return Response(RefreshJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class RefreshJobView(generics.RetrieveAPIView):
+    """Report the progress of a refresh job."""
+
+    queryset = RefreshJob.objects.all()
+    serializer_class = RefreshJobSerializer
+
+
+class RefreshEventsView(View):
+    """Stream a refresh job's progress and new summaries as server-sent events.
+
+    A plain Django view: DRF's content negotiation has no renderer for
+    ``text/event-stream``, which is what EventSource asks for.
+    """
+
+    def get(self, request, pk):
+        job = get_object_or_404(RefreshJob, pk=pk)
+        try:
+            last_event_id = int(request.headers['Last-Event-ID'])
+        except (KeyError, ValueError):
+            last_event_id = None
+        stream = RefreshEventStream(job.pk, last_event_id=last_event_id, **stream_options())
+        response = StreamingHttpResponse(
+            aiter(stream) if isinstance(request, ASGIRequest) else iter(stream),
+            content_type='text/event-stream',
         )
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+
+# Async read endpoints (/api/async/...). Under ASGI a sync view holds a
+# thread for its whole run; these run on the event loop and hand only their
+# queries to a thread. Same data as the DRF views above, plain JSON.
+
+async def async_article_list(request):
+    """The latest front page, like ``GET /api/articles/`` (``?batch=``, ``?fields=``)."""
+    try:
+        batch_id = _batch_param(request.GET)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+
+    async def render():
+        if batch_id is not None:
+            batch = await aget_object_or_404(ScrapeBatch, pk=batch_id)
+        else:
+            batch = await ScrapeBatch.objects.filter(finished_at__isnull=False).order_by('-finished_at').afirst()
+        if batch is None:
+            latest_scrape = (await Article.objects.aaggregate(Max('scraped_at')))['scraped_at__max']
+            queryset = _legacy_front_page(latest_scrape)
+        else:
+            queryset = _batch_front_page(batch)
+        articles = [article async for article in queryset]
+        results = ArticleListSerializer(articles, many=True, context={'request': Request(request)}).data
+        # The page-number envelope of the DRF endpoint; the list is one page.
+        return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+    return await acached_json_response(request, render)
+
+
+async def async_article_detail(request, pk):
+    async def render():
+        article = await aget_object_or_404(Article.objects.with_latest_summary(), pk=pk)
+        return ArticleSerializer(article, context={'request': Request(request)}).data
+
+    return await acached_json_response(request, render)
+
+
+async def async_summary_list(request):
+    """Summaries oldest first, with the filters of ``GET /api/summaries/``.
+
+    Paged by the same :class:`SummaryCursorPagination`, so cursors and
+    ``next``/``previous`` links work on either endpoint; only the page query
+    runs in a thread.
+    """
+    drf_request = Request(request)
+    try:
+        queryset = _filter_summaries(Summary.objects.order_by('generated_at', 'id'), request.GET)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+
+    async def render():
+        paginator = SummaryCursorPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, drf_request)
+        results = SummarySerializer(page, many=True, context={'request': drf_request}).data
+        return paginator.get_paginated_response(results).data
+
+    try:
+        return await acached_json_response(request, render)
+    except NotFound as exc:
+        return JsonResponse({'detail': exc.detail}, status=status.HTTP_404_NOT_FOUND)
 
 
-# Create your views here.
+# Create your views here.
\ No newline at end of file